@@ -0,0 +1,48 @@
+import logging
+
+from fastapi import APIRouter, Form, HTTPException, Response, status
+from jose import JWTError
+
+from app.core.jwks import JWKSFetchError, verify_logout_token
+from app.core.revocation import revocations
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/backchannel-logout")
+async def backchannel_logout(logout_token: str = Form(...)):
+    """
+    Receive an OpenID Connect back-channel logout from Keycloak.
+
+    Keycloak calls this endpoint when a session ends, e.g. on a
+    federated logout. The logout token is verified against the realm's
+    JWKS, and tokens of the session (or, without a sid, of the user)
+    are rejected from then on.
+
+    Set it as the client's "Backchannel logout URL" in Keycloak.
+    With TOKEN_CACHE_URL set, the revocation is shared through Redis, so
+    every worker rejects the session's tokens, not only the one that
+    receives the call.
+    """
+    try:
+        claims = await verify_logout_token(logout_token)
+    except JWKSFetchError as e:
+        # Not a bad token: answer with an error Keycloak reports as a failed logout
+        logger.error("Back-channel logout not verified: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service unavailable",
+            headers={"Cache-Control": "no-store"},
+        )
+    except JWTError as e:
+        logger.info("Rejected back-channel logout: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid logout token",
+            headers={"Cache-Control": "no-store"},
+        )
+
+    await revocations.revoke_logout(claims)
+    return Response(status_code=status.HTTP_200_OK, headers={"Cache-Control": "no-store"})
@@ -1,23 +1,66 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
 
+from app.config import settings
+from app.core.etag import PRIVATE_CACHE_HEADERS, etag_matches, expected_version, make_etag, not_modified, version_etag
+from app.core.export import ExportFormat, export_response
+from app.core.pagination import decode_cursor, set_next_cursor, set_total_count
+from app.core.serialization import json_rows_response
 from app.core.security import get_current_user, has_role
-from app.models.database import get_db
-from app.schemas.item import Item, ItemCreate, ItemUpdate
+from app.models.database import DbSession, get_db, run_db
+from app.schemas.item import Item, ItemCreate, ItemUpdate, ItemBatchUpdate, ItemBatchDelete, ItemBatchResult
 from app.schemas.user import UserInfo
+from app.services.exceptions import VersionConflictError
 from app.services.item_service import ItemService
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 
+async def _list_items(
+        db: DbSession,
+        owner_id: str | None,
+        skip: int,
+        limit: int,
+        cursor: str | None,
+        q: str | None
+) -> Response:
+    """
+    Build a page of items, of one owner or of all owners if owner_id is None.
+
+    Rows are read as plain columns and serialized directly, without
+    ORM objects or per-row response model validation. Listings without
+    a search query carry the total count headers.
+    """
+    if q:
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor cannot be combined with a search query")
+        rows = await run_db(db, ItemService.search_items_rows, query=q, owner_id=owner_id, skip=skip, limit=limit)
+        return json_rows_response(rows)
+
+    after_id = decode_cursor(cursor) if cursor else None
+    if owner_id is None:
+        rows = await run_db(db, ItemService.get_items_rows, skip=skip, limit=limit, after_id=after_id)
+    else:
+        rows = await run_db(
+            db, ItemService.get_user_items_rows, user_id=owner_id, skip=skip, limit=limit, after_id=after_id
+        )
+    total, exact = await run_db(db, ItemService.count_items, owner_id=owner_id)
+
+    response = json_rows_response(rows)
+    set_next_cursor(response, rows, limit)
+    set_total_count(response, total, exact)
+    return response
+
+
 @router.get("", response_model=List[Item])
 async def read_items(
         skip: int = 0,
         limit: int = 100,
+        cursor: str | None = None,
+        q: str | None = None,
         all_items: bool = False,
-        db: Session = Depends(get_db),
+        db: DbSession = Depends(get_db),
         current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -26,6 +69,12 @@ async def read_items(
     If all_items=True and the user has the admin role, returns all items.
     Otherwise, returns only the current user's items.
 
+    Items are ordered by ID. A full page carries an X-Next-Cursor header;
+    pass it back as cursor to get the next page (skip is then ignored).
+    X-Total-Count has the number of items across all pages.
+    With q, only items whose title or description match are returned,
+    best matches first, paged with skip and limit.
+
     This endpoint requires authentication.
     """
     # Check if the user wants to see all items and has admin role
@@ -34,51 +83,80 @@ async def read_items(
         realm_roles = current_user.realm_access.get("roles", []) if current_user.realm_access else []
         if "admin" in realm_roles:
             # User is an admin, return all items
-            items = ItemService.get_items(db, skip=skip, limit=limit)
-            return items
+            return await _list_items(db, None, skip, limit, cursor, q)
 
     # Return only the user's items (default)
-    items = ItemService.get_user_items(db, user_id=current_user.sub, skip=skip, limit=limit)
-    return items
+    return await _list_items(db, current_user.sub, skip, limit, cursor, q)
 
 
 @router.get("/me", response_model=List[Item])
 async def read_user_items(
+        request: Request,
         skip: int = 0,
         limit: int = 100,
-        db: Session = Depends(get_db),
+        cursor: str | None = None,
+        q: str | None = None,
+        db: DbSession = Depends(get_db),
         current_user: UserInfo = Depends(get_current_user)
 ):
     """
     Get all items owned by the current user.
 
+    Supports cursor pagination through the X-Next-Cursor header, and
+    ranked search with q.
+
+    The response has an ETag built from the version of the user's
+    listing, which every write to their items increments; if it matches
+    If-None-Match, 304 Not Modified is returned after reading only that
+    version.
+
     This endpoint requires authentication.
     """
-    items = ItemService.get_user_items(db, user_id=current_user.sub, skip=skip, limit=limit)
-    return items
+    version = await run_db(db, ItemService.get_user_items_version, user_id=current_user.sub)
+    etag = make_etag("items", current_user.sub, request.url.query, version)
+    if etag_matches(request, etag):
+        return not_modified(etag, PRIVATE_CACHE_HEADERS)
+
+    response = await _list_items(db, current_user.sub, skip, limit, cursor, q)
+    response.headers.update(PRIVATE_CACHE_HEADERS)
+    response.headers["ETag"] = etag
+    return response
 
 
 @router.get("/{item_id}", response_model=Item)
 async def read_item(
         item_id: int,
-        db: Session = Depends(get_db),
+        request: Request,
+        response: Response,
+        db: DbSession = Depends(get_db),
         current_user: UserInfo = Depends(get_current_user)
 ):
     """
     Get a specific item by ID.
 
+    The response has an ETag; if it matches If-None-Match, 304 Not
+    Modified is returned after looking up only the item's version.
+
     This endpoint requires authentication.
     """
-    item = ItemService.get_item(db, item_id=item_id)
+    version = await run_db(db, ItemService.get_item_version, item_id=item_id)
+    if version is not None:
+        etag = version_etag(version)
+        if etag_matches(request, etag):
+            return not_modified(etag)
+
+    item = await run_db(db, ItemService.get_item, item_id=item_id)
     if item is None:
         raise HTTPException(status_code=404, detail="Item not found")
+
+    response.headers["ETag"] = version_etag(item.version)
     return item
 
 
 @router.post("", response_model=Item, status_code=status.HTTP_201_CREATED)
 async def create_item(
         item: ItemCreate,
-        db: Session = Depends(get_db),
+        db: DbSession = Depends(get_db),
         current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -86,31 +164,114 @@ async def create_item(
 
     This endpoint requires authentication.
     """
-    return ItemService.create_item(db=db, item=item, owner_id=current_user.sub)
+    return await run_db(db, ItemService.create_item, item=item, owner_id=current_user.sub)
+
+
+def _check_batch_size(size: int) -> None:
+    if size > settings.ITEM_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch size exceeds the maximum of {settings.ITEM_BATCH_MAX_SIZE}",
+        )
+
+
+@router.post("/batch", response_model=List[ItemBatchResult], status_code=status.HTTP_201_CREATED)
+async def create_items(
+        items: List[ItemCreate],
+        db: DbSession = Depends(get_db),
+        current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Create several items in one transaction.
+
+    This endpoint requires authentication.
+    """
+    _check_batch_size(len(items))
+    created = await run_db(db, ItemService.create_items, items=items, owner_id=current_user.sub)
+    return [ItemBatchResult(id=item.id, status="created", item=item) for item in created]
+
+
+@router.put("/batch", response_model=List[ItemBatchResult])
+async def update_items(
+        items: List[ItemBatchUpdate],
+        db: DbSession = Depends(get_db),
+        current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Update several items in one transaction.
+
+    Each entry reports "updated", or "not_found" if the item does not
+    exist or the current user is not its owner.
+
+    This endpoint requires authentication.
+    """
+    _check_batch_size(len(items))
+    updated = await run_db(db, ItemService.update_items, item_updates=items, current_user=current_user)
+    return [
+        ItemBatchResult(id=entry.id, status="updated", item=item) if item is not None
+        else ItemBatchResult(id=entry.id, status="not_found")
+        for entry, item in zip(items, updated)
+    ]
+
+
+@router.post("/batch/delete", response_model=List[ItemBatchResult])
+async def delete_items(
+        batch: ItemBatchDelete,
+        db: DbSession = Depends(get_db),
+        current_user: UserInfo = Depends(get_current_user)
+):
+    """
+    Delete several items in one statement.
+
+    Each entry reports "deleted", or "not_found" if the item does not
+    exist or the current user is not its owner.
+
+    This endpoint requires authentication.
+    """
+    _check_batch_size(len(batch.ids))
+    deleted = await run_db(db, ItemService.delete_items, item_ids=batch.ids, current_user=current_user)
+    return [
+        ItemBatchResult(id=item_id, status="deleted" if item_id in deleted else "not_found")
+        for item_id in batch.ids
+    ]
 
 
 @router.put("/{item_id}", response_model=Item)
 async def update_item(
         item_id: int,
         item: ItemUpdate,
-        db: Session = Depends(get_db),
+        response: Response,
+        if_match: str | None = Header(None),
+        db: DbSession = Depends(get_db),
         current_user: UserInfo = Depends(get_current_user)
 ):
     """
     Update an item.
 
+    With an If-Match header holding the item's ETag, the update only
+    applies if the item was not changed since; otherwise it fails with
+    412 Precondition Failed. The response has the item's new ETag.
+
     This endpoint requires authentication and the current user must be the owner.
     """
-    updated_item = ItemService.update_item(db=db, item_id=item_id, item_update=item, current_user=current_user)
+    try:
+        updated_item = await run_db(
+            db, ItemService.update_item, item_id=item_id, item_update=item, current_user=current_user,
+            expected_version=expected_version(if_match)
+        )
+    except VersionConflictError:
+        raise HTTPException(status_code=412, detail="Item was modified since it was read")
     if updated_item is None:
         raise HTTPException(status_code=404, detail="Item not found or you don't have permission to update it")
+
+    response.headers["ETag"] = version_etag(updated_item.version)
     return updated_item
 
 
 @router.delete("/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_item(
         item_id: int,
-        db: Session = Depends(get_db),
+        db: DbSession = Depends(get_db),
         current_user: UserInfo = Depends(get_current_user)
 ):
     """
@@ -118,7 +279,7 @@ async def delete_item(
 
     This endpoint requires authentication and the current user must be the owner.
     """
-    success = ItemService.delete_item(db=db, item_id=item_id, current_user=current_user)
+    success = await run_db(db, ItemService.delete_item, item_id=item_id, current_user=current_user)
     if not success:
         raise HTTPException(status_code=404, detail="Item not found or you don't have permission to delete it")
     return None
@@ -128,13 +289,32 @@ async def delete_item(
 async def read_all_items_admin(
         skip: int = 0,
         limit: int = 100,
-        db: Session = Depends(get_db),
+        cursor: str | None = None,
+        q: str | None = None,
+        db: DbSession = Depends(get_db),
         _: bool = Depends(has_role(["admin"]))
 ):
     """
     Get all items (admin only).
 
+    Supports cursor pagination through the X-Next-Cursor header, and
+    ranked search with q.
+
+    This endpoint requires authentication and the admin role.
+    """
+    return await _list_items(db, None, skip, limit, cursor, q)
+
+
+@router.get("/admin/export")
+async def export_items_admin(
+        export_format: ExportFormat = Query("ndjson", alias="format"),
+        _: bool = Depends(has_role(["admin"]))
+):
+    """
+    Export all items as NDJSON or CSV (admin only).
+
+    The export is streamed, so it can cover any number of items.
+
     This endpoint requires authentication and the admin role.
     """
-    items = ItemService.get_items(db, skip=skip, limit=limit)
-    return items
+    return export_response(ItemService.stream_items, export_format, "items")
@@ -1,11 +1,15 @@
 from typing import List
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
 
+from app.core.etag import PRIVATE_CACHE_HEADERS, etag_matches, expected_version, not_modified, version_etag
+from app.core.export import ExportFormat, export_response
+from app.core.pagination import decode_cursor, set_next_cursor, set_total_count
+from app.core.serialization import json_rows_response
 from app.core.security import get_current_user, has_role
-from app.models.database import get_db
+from app.models.database import DbSession, get_db, run_db
 from app.schemas.user import UserInfo, UserVO, UserUpdate
+from app.services.exceptions import VersionConflictError
 from app.services.user_service import UserService
 
 router = APIRouter(prefix="/users", tags=["users"])
@@ -23,38 +27,73 @@ async def read_users_me(current_user: UserInfo = Depends(get_current_user)):
 
 @router.get("/me/profile", response_model=UserVO)
 async def read_user_profile(
-        db: Session = Depends(get_db),
+        request: Request,
+        response: Response,
+        db: DbSession = Depends(get_db),
         current_user: UserInfo = Depends(get_current_user)
 ):
     """
     Get the user's profile information from the application database.
 
+    The response has an ETag; if it matches If-None-Match, 304 Not
+    Modified is returned after looking up only the profile's version.
+
     This endpoint requires authentication.
     """
-    # Synchronize user data from Keycloak
-    user = UserService.sync_user(db, current_user)
+    # Synchronize user data from Keycloak unless it was recently mirrored unchanged
+    user = None
+    if UserService.is_synced(current_user):
+        version = await run_db(db, UserService.get_user_version, user_id=current_user.sub)
+        if version is not None:
+            etag = version_etag(version, scope=current_user.sub)
+            if etag_matches(request, etag):
+                return not_modified(etag, PRIVATE_CACHE_HEADERS)
+            user = await run_db(db, UserService.get_user, user_id=current_user.sub)
+    if user is None:
+        user = await run_db(db, UserService.sync_user, current_user)
+
+    response.headers.update(PRIVATE_CACHE_HEADERS)
+    response.headers["ETag"] = version_etag(user.version, scope=current_user.sub)
     return user
 
 
 @router.put("/me/profile", response_model=UserVO)
 async def update_user_profile(
         user_update: UserUpdate,
-        db: Session = Depends(get_db),
+        response: Response,
+        if_match: str | None = Header(None),
+        db: DbSession = Depends(get_db),
         current_user: UserInfo = Depends(get_current_user)
 ):
     """
     Update the user's profile information.
 
+    With an If-Match header holding the profile's ETag, the update only
+    applies if the profile was not changed since; otherwise it fails
+    with 412 Precondition Failed. The response has the new ETag.
+
     This endpoint requires authentication.
     """
+    version = expected_version(if_match, scope=current_user.sub)
+
     # Ensure the user exists in the database
-    UserService.sync_user(db, current_user)
+    if not UserService.is_synced(current_user):
+        await run_db(db, UserService.sync_user, current_user)
 
     # Update the user profile
-    updated_user = UserService.update_user(db, current_user.sub, user_update)
+    try:
+        updated_user = await run_db(db, UserService.update_user, current_user.sub, user_update, version)
+        if updated_user is None:
+            # The user was removed since it was last synced
+            await run_db(db, UserService.sync_user, current_user)
+            updated_user = await run_db(db, UserService.update_user, current_user.sub, user_update, version)
+    except VersionConflictError:
+        raise HTTPException(status_code=412, detail="Profile was modified since it was read")
     if not updated_user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    response.headers.update(PRIVATE_CACHE_HEADERS)
+    response.headers["ETag"] = version_etag(updated_user.version, scope=current_user.sub)
     return updated_user
 
 
@@ -62,22 +101,50 @@ async def update_user_profile(
 async def read_users(
         skip: int = 0,
         limit: int = 100,
-        db: Session = Depends(get_db),
+        cursor: str | None = None,
+        db: DbSession = Depends(get_db),
         _: bool = Depends(has_role(["admin"]))
 ):
     """
     Get all users (admin only).
 
+    Supports cursor pagination through the X-Next-Cursor header. The
+    X-Total-Count header has the number of users, which may be cached
+    or estimated on large tables (X-Total-Count-Exact is then false).
+    Rows are serialized directly, without ORM objects or per-row
+    validation.
+
+    This endpoint requires authentication and the admin role.
+    """
+    after_id = decode_cursor(cursor, key_type=str) if cursor else None
+    rows = await run_db(db, UserService.get_users_rows, skip=skip, limit=limit, after_id=after_id)
+    total, exact = await run_db(db, UserService.count_users)
+
+    response = json_rows_response(rows)
+    set_next_cursor(response, rows, limit)
+    set_total_count(response, total, exact)
+    return response
+
+
+@router.get("/export")
+async def export_users(
+        export_format: ExportFormat = Query("ndjson", alias="format"),
+        _: bool = Depends(has_role(["admin"]))
+):
+    """
+    Export all users as NDJSON or CSV (admin only).
+
+    The export is streamed, so it can cover any number of users.
+
     This endpoint requires authentication and the admin role.
     """
-    users = UserService.get_users(db, skip=skip, limit=limit)
-    return users
+    return export_response(UserService.stream_users, export_format, "users")
 
 
 @router.get("/{user_id}", response_model=UserVO)
 async def read_user(
         user_id: str,
-        db: Session = Depends(get_db),
+        db: DbSession = Depends(get_db),
         _: bool = Depends(has_role(["admin"]))
 ):
     """
@@ -85,7 +152,7 @@ async def read_user(
 
     This endpoint requires authentication and the admin role.
     """
-    user = UserService.get_user(db, user_id=user_id)
+    user = await run_db(db, UserService.get_user, user_id=user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -20,6 +20,36 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
 
+    # Serve requests through an async engine (asyncpg / aiosqlite) instead of the sync one
+    DATABASE_ASYNC: bool = False
+    # Async driver URL, derived from DATABASE_URL if not set
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool, per worker process
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # Expose per-worker pool and cache statistics at /internal/metrics; the endpoint is
+    # unauthenticated and served on the API port, so only enable it behind a private network
+    INTERNAL_METRICS_ENABLED: bool = False
+
+    # Background dependency probes behind /ready; results older than the max age count as failed
+    READINESS_PROBE_INTERVAL_SECONDS: float = 5.0
+    READINESS_PROBE_TIMEOUT_SECONDS: float = 2.0
+    READINESS_MAX_AGE_SECONDS: float = 15.0
+
+    # Export Prometheus metrics at /metrics (set PROMETHEUS_MULTIPROC_DIR with several workers);
+    # the endpoint is unauthenticated and served on the API port, so only enable it where
+    # that port is not publicly reachable, or block /metrics at the proxy
+    PROMETHEUS_METRICS_ENABLED: bool = False
+
+    # Time auth, database and serialization per request, reported in a Server-Timing
+    # header and as per-route histograms at /internal/metrics
+    SERVER_TIMING_ENABLED: bool = False
+
     # Keycloak
     KEYCLOAK_SERVER_URL: str
     KEYCLOAK_REALM: str
@@ -35,13 +65,85 @@ class Settings(BaseSettings):
     # Keycloak admin API endpoints
     KEYCLOAK_ADMIN_URL: str = "{server_url}/admin/realms/{realm}"
 
+    # Realm JSON Web Key Set endpoint
+    KEYCLOAK_JWKS_ENDPOINT: str = "{server_url}/realms/{realm}/protocol/openid-connect/certs"
+
+    # Expected token issuer, may differ from the server URL behind a proxy
+    KEYCLOAK_ISSUER: str = "{server_url}/realms/{realm}"
+
+    # Expected token audience, defaults to KEYCLOAK_CLIENT_ID
+    KEYCLOAK_AUDIENCE: str | None = None
+
+    # Token validation mode: "jwks" (local signature check) or "introspection"
+    KEYCLOAK_TOKEN_VALIDATION: str = "introspection"
+    KEYCLOAK_JWKS_ALGORITHMS: list[str] = ["RS256"]
+    KEYCLOAK_JWKS_CACHE_TTL_SECONDS: int = 3600
+    KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL_SECONDS: int = 30
+
+    # Shared HTTP client for Keycloak calls
+    KEYCLOAK_HTTP2: bool = True
+    KEYCLOAK_HTTP_MAX_CONNECTIONS: int = 100
+    KEYCLOAK_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    KEYCLOAK_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    KEYCLOAK_HTTP_TIMEOUT_SECONDS: float = 5.0
+    KEYCLOAK_HTTP_CONNECT_TIMEOUT_SECONDS: float = 2.0
+
+    # Maximum number of entries in one bulk item request
+    ITEM_BATCH_MAX_SIZE: int = 1000
+
+    # PostgreSQL text search configuration for item search (changing it requires rebuilding the index)
+    SEARCH_TEXT_CONFIG: str = "simple"
+
+    # Total counts of whole tables: exact counts are cached this long per worker, and
+    # PostgreSQL tables estimated at or above the threshold report the planner's estimate
+    COUNT_CACHE_TTL_SECONDS: int = 30
+    COUNT_ESTIMATE_THRESHOLD: int = 100000
+
+    # Rows fetched and serialized per batch in streaming exports
+    EXPORT_BATCH_SIZE: int = 1000
+
     # Token settings
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Introspection result cache, bounded by size and by the token's own expiry
+    TOKEN_CACHE_MAX_SIZE: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 60
+    TOKEN_NEGATIVE_CACHE_TTL_SECONDS: int = 5
+    # Shared introspection cache behind the per-worker one: redis://host:6379/0,
+    # or memory:// for an in-process stand-in; unset for per-worker caching only
+    TOKEN_CACHE_URL: str | None = None
+    # Redis must answer fast or count as a miss: every authenticated request waits on it
+    TOKEN_CACHE_CONNECT_TIMEOUT_SECONDS: float = 0.5
+    TOKEN_CACHE_SOCKET_TIMEOUT_SECONDS: float = 0.25
+
+    # How long back-channel logouts are kept: at least the realm's longest access token
+    # lifespan, or tokens issued before a logout are accepted again once it is dropped
+    REVOCATION_RETENTION_SECONDS: int = 3600
+
+    # Per-worker record of users already mirrored from Keycloak. It is not shared: a
+    # profile edit that changes username or email clears it only in the worker that
+    # served the edit, so the others skip re-syncing that user from the token for up
+    # to USER_SYNC_CACHE_TTL_SECONDS. Lower the TTL to narrow that window.
+    USER_SYNC_CACHE_MAX_SIZE: int = 10000
+    USER_SYNC_CACHE_TTL_SECONDS: int = 300
+
     # CORS
     CORS_ORIGINS: list[str] = ["http://localhost:3000"]
 
-    @field_validator("CORS_ORIGINS", mode='before')
+    @field_validator("KEYCLOAK_TOKEN_VALIDATION")
+    def check_token_validation(cls, v):
+        if v not in ("jwks", "introspection"):
+            raise ValueError("KEYCLOAK_TOKEN_VALIDATION must be 'jwks' or 'introspection'")
+        return v
+
+    @field_validator("SEARCH_TEXT_CONFIG")
+    def check_search_text_config(cls, v):
+        # Embedded in index DDL, so it must be a plain identifier
+        if not v.isidentifier():
+            raise ValueError("SEARCH_TEXT_CONFIG must be a text search configuration name")
+        return v
+
+    @field_validator("CORS_ORIGINS", "KEYCLOAK_JWKS_ALGORITHMS", mode='before')
     def parse_json(cls, v):
         if isinstance(v, str):
             return json.loads(v)
@@ -53,6 +155,15 @@ class Settings(BaseSettings):
         case_sensitive=True,
     )
 
+    def get_async_database_url(self) -> str:
+        """Returns the database URL with an async driver."""
+        if self.ASYNC_DATABASE_URL:
+            return self.ASYNC_DATABASE_URL
+
+        backend, _, rest = self.DATABASE_URL.partition("://")
+        drivers = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+        return f"{drivers.get(backend.split('+')[0], backend)}://{rest}"
+
     def get_keycloak_introspection_endpoint(self) -> str:
         """Returns the full token introspection endpoint URL."""
         return self.KEYCLOAK_INTROSPECTION_ENDPOINT.format(
@@ -67,6 +178,24 @@ class Settings(BaseSettings):
             realm=self.KEYCLOAK_REALM
         )
 
+    def get_keycloak_jwks_endpoint(self) -> str:
+        """Returns the full JWKS endpoint URL."""
+        return self.KEYCLOAK_JWKS_ENDPOINT.format(
+            server_url=self.KEYCLOAK_SERVER_URL,
+            realm=self.KEYCLOAK_REALM
+        )
+
+    def get_keycloak_issuer(self) -> str:
+        """Returns the expected token issuer."""
+        return self.KEYCLOAK_ISSUER.format(
+            server_url=self.KEYCLOAK_SERVER_URL,
+            realm=self.KEYCLOAK_REALM
+        )
+
+    def get_keycloak_audience(self) -> str:
+        """Returns the expected token audience."""
+        return self.KEYCLOAK_AUDIENCE or self.KEYCLOAK_CLIENT_ID
+
     def get_keycloak_admin_url(self) -> str:
         """Returns the base admin API URL."""
         return self.KEYCLOAK_ADMIN_URL.format(
@@ -0,0 +1,284 @@
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+from app.config import settings
+from app.core.cache import TTLCache
+from app.core.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+    _REDIS_ERRORS: tuple[type[Exception], ...] = (RedisError, OSError)
+except ImportError:
+    aioredis = None
+    _REDIS_ERRORS = (OSError,)
+
+
+class CacheBackend(ABC):
+    """
+    An async key-value cache with per-entry expiry.
+
+    Values must be JSON-serializable, so that any backend can store
+    them. A backend that cannot be reached behaves as a miss, so a
+    cache outage never fails a request.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Returns the value of a key, or None if it is missing or expired."""
+
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        """Returns the values of several keys, with None for each missing or expired one."""
+        return [await self.get(key) for key in keys]
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove a key, if present."""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Returns the backend's hit, miss and error statistics."""
+
+    async def close(self) -> None:
+        """Release the backend's connections, if any."""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Cache backend in the worker's own memory, bounded by a TTLCache."""
+
+    def __init__(self, cache: TTLCache):
+        self.cache = cache
+
+    async def get(self, key: str) -> Any | None:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        self.cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+
+class FakeRedis:
+    """
+    In-process stand-in for a Redis client, for tests and local runs.
+
+    Implements only the commands RedisCacheBackend uses. Entries are not
+    shared between processes.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, tuple[float | None, bytes]] = {}
+
+    async def get(self, name: str) -> bytes | None:
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[name]
+            return None
+        return value
+
+    async def mget(self, keys: list[str]) -> list[bytes | None]:
+        return [await self.get(name) for name in keys]
+
+    async def set(self, name: str, value: bytes, px: int | None = None) -> bool:
+        expires_at = time.monotonic() + px / 1000 if px is not None else None
+        self._entries[name] = (expires_at, value)
+        return True
+
+    async def delete(self, *names: str) -> int:
+        return sum(self._entries.pop(name, None) is not None for name in names)
+
+    async def aclose(self) -> None:
+        self._entries.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Cache backend on a Redis server, shared by all workers and instances.
+
+    Values are stored as JSON under namespace-prefixed keys and expire
+    through Redis' own TTLs. Redis errors are logged and count as misses.
+    """
+
+    def __init__(self, client: Any, namespace: str, max_ttl: float):
+        self.client = client
+        self.namespace = namespace
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Any | None:
+        try:
+            raw = await self.client.get(self._key(key))
+        except _REDIS_ERRORS as e:
+            self.errors += 1
+            logger.warning("Cache read failed: %s", e)
+            return None
+
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(raw)
+
+    async def get_many(self, keys: list[str]) -> list[Any | None]:
+        # One MGET round trip instead of a GET per key
+        try:
+            raws = await self.client.mget([self._key(key) for key in keys])
+        except _REDIS_ERRORS as e:
+            self.errors += 1
+            logger.warning("Cache read failed: %s", e)
+            return [None] * len(keys)
+
+        values = [json.loads(raw) if raw is not None else None for raw in raws]
+        found = sum(value is not None for value in values)
+        self.hits += found
+        self.misses += len(values) - found
+        return values
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        ttl = min(ttl, self.max_ttl)
+        if ttl <= 0:
+            return
+        try:
+            await self.client.set(self._key(key), dumps(value), px=max(int(ttl * 1000), 1))
+        except _REDIS_ERRORS as e:
+            self.errors += 1
+            logger.warning("Cache write failed: %s", e)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self.client.delete(self._key(key))
+        except _REDIS_ERRORS as e:
+            self.errors += 1
+            logger.warning("Cache delete failed: %s", e)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "errors": self.errors}
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class TieredCacheBackend(CacheBackend):
+    """
+    Two-tier cache: a per-worker L1 in front of a shared L2.
+
+    Reads try L1, then L2, and copy L2 hits into L1. Writes go to both.
+    L2 entries carry their absolute expiry, so a copy in L1 never
+    outlives the original.
+    """
+
+    def __init__(self, l1: CacheBackend, l2: CacheBackend):
+        self.l1 = l1
+        self.l2 = l2
+
+    async def get(self, key: str) -> Any | None:
+        value = await self.l1.get(key)
+        if value is not None:
+            return value
+
+        entry = await self.l2.get(key)
+        if entry is None:
+            return None
+
+        ttl = entry["expires_at"] - time.time()
+        if ttl <= 0:
+            return None
+        await self.l1.set(key, entry["value"], ttl)
+        return entry["value"]
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self.l1.set(key, value, ttl)
+        await self.l2.set(key, {"value": value, "expires_at": time.time() + ttl}, ttl)
+
+    async def delete(self, key: str) -> None:
+        await self.l1.delete(key)
+        await self.l2.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"l1": self.l1.stats(), "l2": self.l2.stats()}
+
+    async def close(self) -> None:
+        await self.l1.close()
+        await self.l2.close()
+
+
+def create_shared_backend(url: str | None, namespace: str, max_ttl: float) -> CacheBackend | None:
+    """
+    Create a cache backend shared by all workers from a URL.
+
+    Args:
+        url: "redis://..." (or "rediss://...") for Redis, "memory://" for
+            FakeRedis, or None for no shared backend.
+        namespace: Prefix of the keys in Redis.
+        max_ttl: Maximum lifetime of an entry, in seconds.
+
+    Redis commands time out after TOKEN_CACHE_SOCKET_TIMEOUT_SECONDS
+    (connecting after TOKEN_CACHE_CONNECT_TIMEOUT_SECONDS) and then
+    count as misses.
+
+    Returns:
+        The shared backend, or None if no URL is given.
+
+    Raises:
+        RuntimeError: If a Redis URL is given but the redis package is not installed.
+    """
+    if not url:
+        return None
+
+    if url == "memory://":
+        client = FakeRedis()
+    elif aioredis is None:
+        raise RuntimeError("A Redis cache URL is configured but the redis package is not installed")
+    else:
+        # Without timeouts, a Redis host that drops packets would hang every request
+        client = aioredis.from_url(
+            url,
+            socket_connect_timeout=settings.TOKEN_CACHE_CONNECT_TIMEOUT_SECONDS,
+            socket_timeout=settings.TOKEN_CACHE_SOCKET_TIMEOUT_SECONDS,
+        )
+
+    return RedisCacheBackend(client, namespace, max_ttl)
+
+
+def create_cache_backend(url: str | None, namespace: str, max_size: int, max_ttl: float) -> CacheBackend:
+    """
+    Create a cache backend from a URL.
+
+    Args:
+        url: None for a per-worker cache only, "redis://..." (or
+            "rediss://...") for a per-worker cache in front of Redis, or
+            "memory://" for the same with FakeRedis in place of Redis.
+        namespace: Prefix of the keys in Redis.
+        max_size: Maximum number of entries in the per-worker cache.
+        max_ttl: Maximum lifetime of an entry, in seconds.
+
+    Returns:
+        The cache backend.
+
+    Raises:
+        RuntimeError: If a Redis URL is given but the redis package is not installed.
+    """
+    local = MemoryCacheBackend(TTLCache(max_size=max_size, max_ttl=max_ttl))
+    shared = create_shared_backend(url, namespace, max_ttl)
+    return local if shared is None else TieredCacheBackend(local, shared)
@@ -0,0 +1,105 @@
+import hashlib
+from typing import Any
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values a representation depends on.
+
+    Args:
+        parts: Identifying values and row versions, e.g. an owner ID and item versions.
+
+    Returns:
+        The quoted entity tag.
+    """
+    digest = hashlib.blake2b("\0".join(map(str, parts)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+# Headers for responses that differ per user at the same URL, such as
+# /users/me/profile: only the user's own cache may store them
+PRIVATE_CACHE_HEADERS = {"Cache-Control": "private", "Vary": "Authorization"}
+
+
+def _scope_prefix(scope: str) -> str:
+    return hashlib.blake2b(scope.encode(), digest_size=8).hexdigest() + "-"
+
+
+def version_etag(version: int, scope: str | None = None) -> str:
+    """
+    Returns the ETag of a single row at a version.
+
+    Unlike make_etag, the version can be read back from an If-Match
+    header with expected_version. Representations served at the same
+    URL to different users must pass a scope, e.g. the user ID, so that
+    one user's tag never matches another user's.
+
+    Args:
+        version: The row version.
+        scope: What the representation belongs to, hashed into the tag.
+
+    Returns:
+        The quoted entity tag, e.g. "3" or "<scope hash>-3".
+    """
+    prefix = _scope_prefix(scope) if scope is not None else ""
+    return f'"{prefix}{version}"'
+
+
+def expected_version(if_match: str | None, scope: str | None = None) -> int | None:
+    """
+    Get the row version a client expects from its If-Match header.
+
+    Args:
+        if_match: The If-Match header, as sent with a version_etag.
+        scope: The scope the version_etag was built with, if any.
+
+    Returns:
+        The expected version, or None if the header is absent or "*".
+
+    Raises:
+        HTTPException: 412 if the header cannot match any version_etag of the scope.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+
+    # If-Match uses strong comparison, so weak or unknown tags never match
+    tag = if_match.strip()
+    prefix = _scope_prefix(scope) if scope is not None else ""
+    if len(tag) > 2 and tag[0] == tag[-1] == '"':
+        version = tag[1:-1]
+        if version.startswith(prefix) and version[len(prefix):].isdigit():
+            return int(version[len(prefix):])
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="If-Match does not match the current version",
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check the request's If-None-Match header against an ETag.
+
+    Uses weak comparison, as RFC 9110 requires for If-None-Match.
+
+    Args:
+        request: The incoming request.
+        etag: The current entity tag of the resource.
+
+    Returns:
+        True if the client's cached copy is current.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+
+    tags = (tag.strip() for tag in header.split(","))
+    return etag in (tag.removeprefix("W/") for tag in tags)
+
+
+def not_modified(etag: str, headers: dict[str, str] | None = None) -> Response:
+    """Returns an empty 304 Not Modified response for an ETag, with any extra headers."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={**(headers or {}), "ETag": etag})
@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Callable, Iterator, Literal
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy.engine import MappingResult
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.database import SessionLocal
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def ndjson_chunks(rows: MappingResult, chunk_size: int) -> Iterator[bytes]:
+    """
+    Serialize rows as newline-delimited JSON, chunk_size rows per chunk.
+
+    Args:
+        rows: The rows to serialize.
+        chunk_size: Number of rows per yielded chunk.
+
+    Yields:
+        Encoded chunks of NDJSON lines.
+    """
+    for partition in rows.partitions(chunk_size):
+        yield "".join(
+            json.dumps(dict(row), default=_json_default, separators=(",", ":")) + "\n"
+            for row in partition
+        ).encode()
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def csv_chunks(rows: MappingResult, chunk_size: int) -> Iterator[bytes]:
+    """
+    Serialize rows as CSV with a header line, chunk_size rows per chunk.
+
+    Nested values (e.g. JSON columns) are written as JSON text.
+
+    Args:
+        rows: The rows to serialize.
+        chunk_size: Number of rows per yielded chunk.
+
+    Yields:
+        Encoded chunks of CSV lines.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(rows.keys())
+
+    for partition in rows.partitions(chunk_size):
+        for row in partition:
+            writer.writerow(_csv_value(value) for value in row.values())
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header only, for an empty export
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def export_response(
+        fetch_rows: Callable[[Session, int], MappingResult],
+        export_format: ExportFormat,
+        filename: str
+) -> StreamingResponse:
+    """
+    Stream the rows of a query as an NDJSON or CSV download.
+
+    The query runs on its own session, because the request's session is
+    closed before the body is streamed. Rows are fetched through a
+    server-side cursor in batches of EXPORT_BATCH_SIZE and serialized
+    batch by batch, so memory use does not grow with the row count. The
+    body is produced in a worker thread, off the event loop.
+
+    Args:
+        fetch_rows: Runs the query on the given session with the given batch size.
+        export_format: "ndjson" or "csv".
+        filename: The download file name, without extension.
+
+    Returns:
+        The streaming response.
+    """
+    batch_size = settings.EXPORT_BATCH_SIZE
+    serialize = ndjson_chunks if export_format == "ndjson" else csv_chunks
+
+    def body() -> Iterator[bytes]:
+        db = SessionLocal()
+        try:
+            yield from serialize(fetch_rows(db, batch_size), batch_size)
+        finally:
+            db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+    )
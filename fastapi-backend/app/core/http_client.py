@@ -0,0 +1,76 @@
+import logging
+
+import httpx
+
+from app.config import settings
+from app.core.prometheus import InstrumentedTransport
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared client for all Keycloak traffic, managed by the application lifespan
+_keycloak_client: httpx.AsyncClient | None = None
+
+
+def create_keycloak_client() -> httpx.AsyncClient:
+    """
+    Create an async HTTP client configured for Keycloak.
+
+    Connections are pooled and kept alive between requests. HTTP/2 is
+    negotiated when enabled and the h2 package is installed. Calls are
+    counted and timed for Prometheus when PROMETHEUS_METRICS_ENABLED is set.
+
+    Returns:
+        A new async HTTP client.
+    """
+    http2 = settings.KEYCLOAK_HTTP2 and HTTP2_AVAILABLE
+    if settings.KEYCLOAK_HTTP2 and not HTTP2_AVAILABLE:
+        logger.warning("KEYCLOAK_HTTP2 is enabled but the h2 package is not installed, using HTTP/1.1")
+
+    transport = httpx.AsyncHTTPTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.KEYCLOAK_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.KEYCLOAK_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.KEYCLOAK_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+    )
+    if settings.PROMETHEUS_METRICS_ENABLED:
+        transport = InstrumentedTransport(transport)
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(
+            settings.KEYCLOAK_HTTP_TIMEOUT_SECONDS,
+            connect=settings.KEYCLOAK_HTTP_CONNECT_TIMEOUT_SECONDS,
+        ),
+    )
+
+
+def get_keycloak_client() -> httpx.AsyncClient:
+    """
+    Get the shared Keycloak HTTP client.
+
+    The client is normally opened by the application lifespan. It is
+    created on first use if the lifespan has not run, e.g. in scripts.
+
+    Returns:
+        The shared async HTTP client.
+    """
+    global _keycloak_client
+    if _keycloak_client is None or _keycloak_client.is_closed:
+        _keycloak_client = create_keycloak_client()
+    return _keycloak_client
+
+
+async def close_keycloak_client() -> None:
+    """Close the shared Keycloak HTTP client and its pooled connections."""
+    global _keycloak_client
+    if _keycloak_client is not None:
+        await _keycloak_client.aclose()
+        _keycloak_client = None
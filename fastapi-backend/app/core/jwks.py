@@ -0,0 +1,167 @@
+import logging
+import time
+from typing import Dict, Any
+
+import httpx
+from jose import jwt, JWTError
+
+from app.config import settings
+from app.core.http_client import get_keycloak_client
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSFetchError(Exception):
+    """
+    Raised when the key set cannot be fetched from Keycloak.
+
+    Unlike a JWTError, it says nothing about the token: Keycloak is
+    unreachable or failing, and the same token may verify later.
+    """
+
+
+class JWKSCache:
+    """
+    Cache of the realm's JSON Web Key Set.
+
+    Keys are fetched from Keycloak on first use and kept for
+    KEYCLOAK_JWKS_CACHE_TTL_SECONDS. A token signed with an unknown
+    key ID triggers an early refresh, which covers key rotation, but
+    refreshes are rate limited so forged key IDs cannot be used to
+    flood Keycloak.
+    """
+
+    def __init__(self, jwks_endpoint: str, ttl: int, min_refresh_interval: int):
+        self.jwks_endpoint = jwks_endpoint
+        self.ttl = ttl
+        self.min_refresh_interval = min_refresh_interval
+        self._keys: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at = 0.0
+        self._refreshes = SingleFlight()
+
+    def _is_stale(self) -> bool:
+        return not self._keys or time.monotonic() - self._fetched_at > self.ttl
+
+    def _can_refresh(self) -> bool:
+        return time.monotonic() - self._fetched_at > self.min_refresh_interval
+
+    async def refresh(self) -> None:
+        """
+        Fetch the key set from Keycloak and replace the cached keys.
+
+        Raises:
+            JWKSFetchError: If the key set cannot be retrieved.
+        """
+        try:
+            response = await get_keycloak_client().get(self.jwks_endpoint)
+            response.raise_for_status()
+            jwks = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise JWKSFetchError(f"Unable to fetch JWKS: {e}") from e
+
+        self._keys = {key["kid"]: key for key in jwks.get("keys", []) if "kid" in key}
+        self._fetched_at = time.monotonic()
+        logger.info("Loaded %d signing keys from %s", len(self._keys), self.jwks_endpoint)
+
+    async def get_key(self, kid: str) -> Dict[str, Any]:
+        """
+        Get the signing key for a key ID.
+
+        Args:
+            kid: The key ID from the token header.
+
+        Returns:
+            The JSON Web Key.
+
+        Raises:
+            JWTError: If no key with that ID is known.
+            JWKSFetchError: If the key set had to be fetched and could not be.
+        """
+        if self._is_stale() or (kid not in self._keys and self._can_refresh()):
+            # Concurrent requests share a single fetch
+            await self._refreshes.do("jwks", self.refresh)
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key: {kid}")
+        return key
+
+
+jwks_cache = JWKSCache(
+    jwks_endpoint=settings.get_keycloak_jwks_endpoint(),
+    ttl=settings.KEYCLOAK_JWKS_CACHE_TTL_SECONDS,
+    min_refresh_interval=settings.KEYCLOAK_JWKS_MIN_REFRESH_INTERVAL_SECONDS,
+)
+
+
+# Event claim that identifies an OpenID Connect back-channel logout token
+BACKCHANNEL_LOGOUT_EVENT = "http://schemas.openid.net/event/backchannel-logout"
+
+
+async def _decode(token: str, audience: str) -> Dict[str, Any]:
+    """Verify a JWT's signature, expiry, issuer and audience, and return its claims."""
+    header = jwt.get_unverified_header(token)
+    kid = header.get("kid")
+    if not kid:
+        raise JWTError("Token header has no key ID")
+
+    key = await jwks_cache.get_key(kid)
+
+    return jwt.decode(
+        token,
+        key,
+        algorithms=settings.KEYCLOAK_JWKS_ALGORITHMS,
+        audience=audience,
+        issuer=settings.get_keycloak_issuer(),
+        options={"verify_at_hash": False},
+    )
+
+
+async def verify_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a JWT locally against the realm's signing keys.
+
+    Checks the signature, expiry, issuer and audience.
+
+    Args:
+        token: The JWT token to verify.
+
+    Returns:
+        The token claims.
+
+    Raises:
+        JWTError: If the token is malformed, expired or not signed by the realm.
+        JWKSFetchError: If the realm's signing keys cannot be fetched.
+    """
+    return await _decode(token, settings.get_keycloak_audience())
+
+
+async def verify_logout_token(token: str) -> Dict[str, Any]:
+    """
+    Verify a back-channel logout token sent by Keycloak.
+
+    Besides the signature and issuer, checks that the token is addressed
+    to this client, carries the back-channel logout event, identifies a
+    session or user, and has no nonce, as OpenID Connect Back-Channel
+    Logout 1.0 requires.
+
+    Args:
+        token: The logout token.
+
+    Returns:
+        The token claims.
+
+    Raises:
+        JWTError: If the token is not a valid logout token.
+        JWKSFetchError: If the realm's signing keys cannot be fetched.
+    """
+    claims = await _decode(token, settings.KEYCLOAK_CLIENT_ID)
+
+    if BACKCHANNEL_LOGOUT_EVENT not in (claims.get("events") or {}):
+        raise JWTError("Token is not a back-channel logout token")
+    if "nonce" in claims:
+        raise JWTError("Logout token must not contain a nonce")
+    if not claims.get("sid") and not claims.get("sub"):
+        raise JWTError("Logout token has neither sid nor sub")
+    return claims
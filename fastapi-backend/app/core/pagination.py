@@ -0,0 +1,83 @@
+import base64
+import json
+from typing import Any, Mapping, Sequence
+
+from fastapi import HTTPException, Response, status
+
+# Response header carrying the cursor for the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Response headers carrying the total number of rows across all pages
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_COUNT_EXACT_HEADER = "X-Total-Count-Exact"
+
+
+def encode_cursor(last_key: int | str) -> str:
+    """
+    Encode the last primary key of a page as an opaque cursor.
+
+    Args:
+        last_key: The primary key of the last row on the page.
+
+    Returns:
+        A URL-safe cursor token.
+    """
+    payload = json.dumps({"k": last_key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, key_type: type = int) -> Any:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: The cursor token from the client.
+        key_type: The expected primary key type.
+
+    Returns:
+        The primary key to continue after.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded))["k"]
+    except (ValueError, TypeError, KeyError):
+        key = None
+
+    if not isinstance(key, key_type) or isinstance(key, bool):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
+    return key
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], limit: int, key: str = "id") -> None:
+    """
+    Add the next-page cursor header if the page is full.
+
+    Args:
+        response: The response to add the header to.
+        rows: The rows of the current page, ordered by primary key.
+        limit: The requested page size.
+        key: The primary key attribute or mapping key of each row.
+    """
+    if rows and len(rows) >= limit:
+        last = rows[-1]
+        last_key = last[key] if isinstance(last, Mapping) else getattr(last, key)
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last_key)
+
+
+def set_total_count(response: Response, total: int, exact: bool = True) -> None:
+    """
+    Add the total count headers.
+
+    Args:
+        response: The response to add the headers to.
+        total: The number of rows across all pages.
+        exact: False if the total is an estimate.
+    """
+    response.headers[TOTAL_COUNT_HEADER] = str(total)
+    response.headers[TOTAL_COUNT_EXACT_HEADER] = "true" if exact else "false"
@@ -0,0 +1,121 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Tuple
+
+_EMPTY: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, slots=True)
+class UserRoles:
+    """
+    The roles granted by a token, normalized for fast membership checks.
+
+    Attributes:
+        realm: Realm roles from realm_access.
+        clients: Client roles from resource_access, keyed by client ID.
+    """
+    realm: frozenset[str]
+    clients: Mapping[str, frozenset[str]]
+
+    @classmethod
+    def from_token(cls, token_data: Dict[str, Any]) -> "UserRoles":
+        """
+        Build the role sets from token claims.
+
+        Args:
+            token_data: The validated token claims.
+
+        Returns:
+            The normalized roles.
+        """
+        realm_access = token_data.get("realm_access") or {}
+        resource_access = token_data.get("resource_access") or {}
+        return cls(
+            realm=frozenset(realm_access.get("roles", ())),
+            clients={
+                client_id: frozenset(access.get("roles", ()))
+                for client_id, access in resource_access.items()
+            },
+        )
+
+    def client(self, client_id: str) -> frozenset[str]:
+        """Returns the roles for a client, or an empty set."""
+        return self.clients.get(client_id, _EMPTY)
+
+
+Predicate = Callable[[UserRoles], bool]
+
+
+class Policy(ABC):
+    """
+    A role requirement that compiles to a predicate over UserRoles.
+
+    Policies are immutable and combine with & and |, e.g.
+    ``RealmRoles({"admin"}) | ClientRoles("backend-client", {"editor"})``.
+    Compile them once, at import or startup, and evaluate the predicate
+    on every request.
+    """
+
+    @abstractmethod
+    def compile(self) -> Predicate:
+        """Returns the predicate that checks this policy against a user's roles."""
+
+    def __and__(self, other: "Policy") -> "Policy":
+        return AllOf((self, other))
+
+    def __or__(self, other: "Policy") -> "Policy":
+        return AnyOf((self, other))
+
+
+@dataclass(frozen=True)
+class RealmRoles(Policy):
+    """Requires any (or all) of the given realm roles."""
+    roles: frozenset[str]
+    require_all: bool = False
+
+    def __post_init__(self):
+        object.__setattr__(self, "roles", frozenset(self.roles))
+
+    def compile(self) -> Predicate:
+        roles = self.roles
+        if self.require_all:
+            return lambda user: roles <= user.realm
+        return lambda user: not roles.isdisjoint(user.realm)
+
+
+@dataclass(frozen=True)
+class ClientRoles(Policy):
+    """Requires any (or all) of the given roles on a client."""
+    client_id: str
+    roles: frozenset[str]
+    require_all: bool = False
+
+    def __post_init__(self):
+        object.__setattr__(self, "roles", frozenset(self.roles))
+
+    def compile(self) -> Predicate:
+        client_id = self.client_id
+        roles = self.roles
+        if self.require_all:
+            return lambda user: roles <= user.client(client_id)
+        return lambda user: not roles.isdisjoint(user.client(client_id))
+
+
+@dataclass(frozen=True)
+class AllOf(Policy):
+    """Requires every nested policy."""
+    policies: Tuple[Policy, ...]
+
+    def compile(self) -> Predicate:
+        predicates = tuple(policy.compile() for policy in self.policies)
+        return lambda user: all(predicate(user) for predicate in predicates)
+
+
+@dataclass(frozen=True)
+class AnyOf(Policy):
+    """Requires at least one nested policy."""
+    policies: Tuple[Policy, ...]
+
+    def compile(self) -> Predicate:
+        predicates = tuple(policy.compile() for policy in self.policies)
+        return lambda user: any(predicate(user) for predicate in predicates)
@@ -0,0 +1,150 @@
+import os
+import time
+
+import httpx
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import DEFAULT_BUCKETS
+from app.core.timing import route_template
+
+# Set for the whole process group (see gunicorn.conf.py); metrics are then
+# written to files there and aggregated over all workers on each scrape
+MULTIPROCESS_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status.",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency, by route template and status.",
+    ["method", "route", "status"],
+    buckets=DEFAULT_BUCKETS,
+)
+
+KEYCLOAK_REQUESTS = Counter(
+    "keycloak_requests_total",
+    "Requests to Keycloak, by endpoint and status (or \"error\" if no response was received).",
+    ["endpoint", "status"],
+)
+KEYCLOAK_REQUEST_DURATION = Histogram(
+    "keycloak_request_duration_seconds",
+    "Latency of requests to Keycloak, up to the response headers.",
+    ["endpoint"],
+    buckets=DEFAULT_BUCKETS,
+)
+
+AUTH_CACHE_LOOKUPS = Counter(
+    "auth_cache_lookups_total",
+    "Token cache lookups in introspection mode, by result (hit or miss).",
+    ["result"],
+)
+
+DB_POOL_EVENTS = Counter(
+    "db_pool_events_total",
+    "Connection pool events: checkouts, checkout_timeouts, connections_opened, overflow_events, invalidations.",
+    ["pool", "event"],
+)
+DB_POOL_CHECKOUT_DURATION = Histogram(
+    "db_pool_checkout_duration_seconds",
+    "Time spent waiting for a pooled database connection.",
+    ["pool"],
+    buckets=DEFAULT_BUCKETS,
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "Database connections currently checked out, summed over live workers.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """
+    Render all metrics in the Prometheus text format.
+
+    In multiprocess mode, the metrics of every worker are aggregated,
+    so any worker can answer the scrape.
+
+    Returns:
+        The encoded metrics and their content type.
+    """
+    if MULTIPROCESS_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def _keycloak_endpoint(url: httpx.URL) -> str:
+    """Returns a low-cardinality label for a Keycloak URL."""
+    name = url.path.rstrip("/").rsplit("/", 1)[-1]
+    return name if name in ("introspect", "certs", "userinfo", "token", "openid-configuration") else "other"
+
+
+class InstrumentedTransport(httpx.AsyncBaseTransport):
+    """HTTP transport wrapper that records Keycloak call counts and latencies."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        endpoint = _keycloak_endpoint(request.url)
+        start = time.perf_counter()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.HTTPError:
+            KEYCLOAK_REQUESTS.labels(endpoint, "error").inc()
+            raise
+        finally:
+            KEYCLOAK_REQUEST_DURATION.labels(endpoint).observe(time.perf_counter() - start)
+
+        KEYCLOAK_REQUESTS.labels(endpoint, str(response.status_code)).inc()
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class PrometheusMiddleware:
+    """
+    Counts and times every HTTP request by method, route template and status.
+
+    Requests that fail with an unhandled exception count as status 500.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            labels = (scope["method"], route_template(scope), str(status_code))
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_REQUEST_DURATION.labels(*labels).observe(time.perf_counter() - start)
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.core.http_client import get_keycloak_client
+from app.models.database import async_engine, engine
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, slots=True)
+class ProbeResult:
+    """The outcome of one dependency probe."""
+    ok: bool
+    checked_at: float
+    latency: float
+    error: str | None = None
+
+
+# Held while a sync probe's SELECT 1 runs; its thread outlives a probe timeout
+_select_one_running = threading.Lock()
+
+
+def _select_one() -> None:
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    finally:
+        _select_one_running.release()
+
+
+async def probe_database() -> None:
+    """
+    Run SELECT 1 on a pooled connection of the database engine in use.
+
+    With a sync engine the query runs in a thread, which a timeout
+    cannot stop. While a previous probe's query is still running, the
+    probe fails at once instead of tying up another thread and pooled
+    connection on a database that does not answer.
+    """
+    if async_engine is not None:
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    else:
+        if not _select_one_running.acquire(blocking=False):
+            raise TimeoutError("The previous database probe is still running")
+        await asyncio.to_thread(_select_one)
+
+
+async def probe_keycloak() -> None:
+    """Fetch the realm's JWKS from Keycloak."""
+    response = await get_keycloak_client().get(settings.get_keycloak_jwks_endpoint())
+    response.raise_for_status()
+
+
+class ReadinessProber:
+    """
+    Probes the application's dependencies in the background.
+
+    Every probe runs each interval, with a timeout, and only its latest
+    result is kept. Readiness checks read those results and never wait
+    on I/O; a result older than max_age counts as failed, so a stuck
+    prober makes the worker unready rather than stale-ready.
+    """
+
+    def __init__(
+            self,
+            probes: Dict[str, Callable[[], Awaitable[None]]],
+            interval: float,
+            timeout: float,
+            max_age: float
+    ):
+        self.probes = probes
+        self.interval = interval
+        self.timeout = timeout
+        self.max_age = max_age
+        self.results: Dict[str, ProbeResult] = {}
+        self._task: asyncio.Task | None = None
+
+    async def _probe(self, name: str, probe: Callable[[], Awaitable[None]]) -> None:
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(probe(), self.timeout)
+        except Exception as e:
+            error = "timeout" if isinstance(e, asyncio.TimeoutError) else type(e).__name__
+            # Log when a dependency goes down, not on every failed probe
+            previous = self.results.get(name)
+            if previous is None or previous.ok:
+                logger.warning("Readiness probe %s failed: %r", name, e)
+            self.results[name] = ProbeResult(False, time.monotonic(), time.monotonic() - start, error)
+        else:
+            self.results[name] = ProbeResult(True, time.monotonic(), time.monotonic() - start)
+
+    async def probe_all(self) -> None:
+        """Run all probes concurrently and store their results."""
+        await asyncio.gather(*(self._probe(name, probe) for name, probe in self.probes.items()))
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe_all()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start probing in a background task of the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> tuple[bool, Dict[str, Any]]:
+        """
+        Get the readiness from the latest probe results.
+
+        Returns:
+            Whether every dependency passed a recent probe, and the
+            details per dependency.
+        """
+        now = time.monotonic()
+        ready = True
+        checks: Dict[str, Any] = {}
+
+        for name in self.probes:
+            result = self.results.get(name)
+            if result is None:
+                ready = False
+                checks[name] = {"ok": False, "error": "not checked yet"}
+                continue
+
+            age = now - result.checked_at
+            fresh = age <= self.max_age
+            ok = result.ok and fresh
+            ready = ready and ok
+            checks[name] = {
+                "ok": ok,
+                "age_seconds": round(age, 3),
+                "latency_seconds": round(result.latency, 4),
+                "error": result.error if not result.ok else (None if fresh else "stale"),
+            }
+
+        return ready, checks
+
+
+prober = ReadinessProber(
+    probes={"database": probe_database, "keycloak": probe_keycloak},
+    interval=settings.READINESS_PROBE_INTERVAL_SECONDS,
+    timeout=settings.READINESS_PROBE_TIMEOUT_SECONDS,
+    max_age=settings.READINESS_MAX_AGE_SECONDS,
+)
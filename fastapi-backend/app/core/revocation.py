@@ -0,0 +1,161 @@
+import heapq
+import time
+from typing import Any, Dict
+
+from app.config import settings
+from app.core.cache_backends import CacheBackend, create_shared_backend
+
+
+class RevocationStore:
+    """
+    Set of revoked sessions, tokens and users.
+
+    Sessions are keyed by sid and tokens by jti; a logout of a whole
+    user revokes every token of theirs issued up to that moment. Each
+    entry is kept only until every token it could match has expired,
+    and expired entries are pruned in expiry order as new ones arrive,
+    so the set stays as small as the number of recent logouts.
+
+    Revocations are kept in the worker's memory and, with a shared
+    backend, published there too: a back-channel logout reaches one
+    worker, and the others find it in the shared backend on their next
+    check, then keep a copy in memory.
+    """
+
+    def __init__(self, retention: float, shared: CacheBackend | None = None):
+        self.retention = retention
+        self.shared = shared
+        self._entries: Dict[str, Dict[str, Any]] = {"sid": {}, "jti": {}, "sub": {}}
+        self._expiries: list[tuple[float, str, str]] = []
+
+    @staticmethod
+    def _expires_at(kind: str, value: Any) -> float:
+        # Subjects hold (issued_before, expires_at), sessions and tokens expires_at
+        return value[1] if kind == "sub" else value
+
+    def _store(self, kind: str, key: str, value: Any) -> None:
+        """Keep a revocation in memory, unless it is already there."""
+        if self._entries[kind].get(key) == value:
+            return
+        self._entries[kind][key] = value
+        heapq.heappush(self._expiries, (self._expires_at(kind, value), kind, key))
+        self.prune()
+
+    async def _revoke(self, kind: str, key: str, value: Any) -> None:
+        self._store(kind, key, value)
+        if self.shared is not None:
+            ttl = self._expires_at(kind, value) - time.time()
+            await self.shared.set(f"{kind}:{key}", value, ttl=ttl)
+
+    async def revoke_session(self, sid: str) -> None:
+        """Revoke all tokens of a session, e.g. after it was logged out."""
+        await self._revoke("sid", sid, time.time() + self.retention)
+
+    async def revoke_token(self, jti: str, exp: float | None = None) -> None:
+        """Revoke a single token until its expiry."""
+        await self._revoke("jti", jti, exp if exp is not None else time.time() + self.retention)
+
+    async def revoke_subject(self, sub: str, issued_before: float | None = None) -> None:
+        """Revoke all tokens of a user issued up to issued_before (default now)."""
+        now = time.time()
+        await self._revoke("sub", sub, (issued_before if issued_before is not None else now, now + self.retention))
+
+    async def revoke_logout(self, logout_claims: Dict[str, Any]) -> None:
+        """
+        Apply a verified back-channel logout token.
+
+        Args:
+            logout_claims: The logout token claims, with sid and/or sub.
+        """
+        if logout_claims.get("sid"):
+            await self.revoke_session(logout_claims["sid"])
+        else:
+            await self.revoke_subject(logout_claims["sub"], logout_claims.get("iat"))
+
+    @staticmethod
+    def _keys(token_data: Dict[str, Any]) -> list[tuple[str, str]]:
+        """Returns the (kind, key) pairs a token can be revoked under."""
+        # Keycloak puts the session ID in sid, and in session_state in older versions
+        keys = [
+            ("sid", token_data.get("sid") or token_data.get("session_state")),
+            ("jti", token_data.get("jti")),
+            ("sub", token_data.get("sub")),
+        ]
+        return [(kind, key) for kind, key in keys if key is not None]
+
+    def _is_revoked_locally(self, token_data: Dict[str, Any]) -> bool:
+        now = time.time()
+        for kind, key in self._keys(token_data):
+            value = self._entries[kind].get(key)
+            if value is None or self._expires_at(kind, value) <= now:
+                continue
+            if kind != "sub" or token_data.get("iat", 0) <= value[0]:
+                return True
+        return False
+
+    async def is_revoked(self, token_data: Dict[str, Any]) -> bool:
+        """
+        Check validated token claims against the revocations.
+
+        A few dictionary lookups, plus with a shared backend a single
+        multi-key read there (one MGET on Redis), cheap enough for every
+        request.
+
+        Args:
+            token_data: The validated token claims.
+
+        Returns:
+            True if the token's session, the token itself or its user was revoked.
+        """
+        if self._is_revoked_locally(token_data):
+            return True
+        if self.shared is None:
+            return False
+
+        # Revocations received by other workers
+        keys = self._keys(token_data)
+        values = await self.shared.get_many([f"{kind}:{key}" for kind, key in keys])
+        found = False
+        for (kind, key), value in zip(keys, values):
+            if value is not None:
+                self._store(kind, key, tuple(value) if kind == "sub" else value)
+                found = True
+        return found and self._is_revoked_locally(token_data)
+
+    def prune(self) -> None:
+        """Drop revocations that can no longer match an unexpired token."""
+        now = time.time()
+        while self._expiries and self._expiries[0][0] <= now:
+            expires_at, kind, key = heapq.heappop(self._expiries)
+            value = self._entries[kind].get(key)
+            # Skip entries that were revoked again since, with a later expiry
+            if value is not None and self._expires_at(kind, value) == expires_at:
+                del self._entries[kind][key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of revoked sessions, tokens and users in this worker's memory."""
+        stats: Dict[str, Any] = {
+            "sessions": len(self._entries["sid"]),
+            "tokens": len(self._entries["jti"]),
+            "subjects": len(self._entries["sub"]),
+        }
+        if self.shared is not None:
+            stats["shared"] = self.shared.stats()
+        return stats
+
+    async def close(self) -> None:
+        """Close the connections of the shared backend."""
+        if self.shared is not None:
+            await self.shared.close()
+
+
+# Revocations are kept for as long as an access token issued before them can live,
+# and shared through the token cache's Redis, if configured, with every worker
+revocations = RevocationStore(
+    retention=settings.REVOCATION_RETENTION_SECONDS,
+    shared=create_shared_backend(
+        settings.TOKEN_CACHE_URL,
+        namespace="revocation",
+        max_ttl=settings.REVOCATION_RETENTION_SECONDS,
+    ),
+)
@@ -1,12 +1,23 @@
+import hashlib
 import logging
+import time
+from functools import lru_cache
 from typing import List, Dict, Any
 
-import requests
+import httpx
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
 
 from app.config import settings
+from app.core.cache_backends import create_cache_backend
+from app.core.http_client import get_keycloak_client
+from app.core.singleflight import SingleFlight
+from app.core.jwks import JWKSFetchError, verify_token
+from app.core.policy import Policy, RealmRoles, ClientRoles, UserRoles
+from app.core.prometheus import AUTH_CACHE_LOOKUPS
+from app.core.revocation import revocations
+from app.core.timing import timed
 from app.schemas.user import UserInfo
 
 logger = logging.getLogger(__name__)
@@ -14,6 +25,20 @@ logger = logging.getLogger(__name__)
 # HTTP Bearer token scheme for extracting the JWT from Authorization header
 oauth2_scheme = HTTPBearer(auto_error=True)
 
+# Introspection results keyed by token hash, optionally shared by all workers
+token_cache = create_cache_backend(
+    settings.TOKEN_CACHE_URL,
+    namespace="token",
+    max_size=settings.TOKEN_CACHE_MAX_SIZE,
+    max_ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
+
+# Cached in place of the claims of a token Keycloak rejected
+_REJECTED_TOKEN = {"active": False}
+
+# In-flight introspections, shared by concurrent requests with the same token
+introspection_calls = SingleFlight()
+
 
 def get_token_from_request(
         credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
@@ -30,7 +55,12 @@ def get_token_from_request(
     return credentials.credentials
 
 
-async def validate_token(token: str) -> Dict[str, Any]:
+def _token_cache_key(token: str) -> str:
+    """Returns the cache key for a token, so raw tokens are never kept in memory."""
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def introspect_token(token: str) -> Dict[str, Any]:
     """
     Validate the token by introspection against Keycloak.
 
@@ -44,7 +74,8 @@ async def validate_token(token: str) -> Dict[str, Any]:
         The token introspection response.
 
     Raises:
-        HTTPException: If the token is invalid or expired.
+        HTTPException: 401 if Keycloak reports the token as inactive, or 503
+            if Keycloak cannot be reached or does not answer with 200.
     """
     # Prepare the introspection request
     introspection_endpoint = settings.get_keycloak_introspection_endpoint()
@@ -52,19 +83,27 @@ async def validate_token(token: str) -> Dict[str, Any]:
     # Client credentials for token introspection
     client_auth = (settings.KEYCLOAK_CLIENT_ID, settings.KEYCLOAK_CLIENT_SECRET)
 
-    # Make the introspection request
-    response = requests.post(
-        introspection_endpoint,
-        data={"token": token, "token_type_hint": "access_token"},
-        auth=client_auth
-    )
+    # Make the introspection request over the shared connection pool
+    try:
+        response = await get_keycloak_client().post(
+            introspection_endpoint,
+            data={"token": token, "token_type_hint": "access_token"},
+            auth=client_auth
+        )
+    except httpx.HTTPError as e:
+        logger.error("Token introspection request failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service unavailable",
+        )
 
-    # Check if the request was successful
+    # Check if the request was successful; a failure (e.g. a Keycloak error or
+    # wrong client credentials) says nothing about the token itself
     if response.status_code != 200:
+        logger.error("Token introspection failed with status %s", response.status_code)
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Failed to validate token",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service unavailable",
         )
 
     # Parse the response
@@ -81,47 +120,140 @@ async def validate_token(token: str) -> Dict[str, Any]:
     return token_data
 
 
-async def get_current_user(
-        token: str = Depends(get_token_from_request)
-) -> UserInfo:
+async def verify_token_locally(token: str) -> Dict[str, Any]:
     """
-    Get the current user from the validated token.
+    Validate the token locally against the realm's JWKS.
 
-    This function validates the token using Keycloak's token
-    introspection endpoint and extracts user information.
+    The signature, expiry, issuer and audience are checked without
+    a round-trip to Keycloak. Signing keys are cached and refreshed
+    when a token carries an unknown key ID.
 
     Args:
-        token: The JWT token from the Authorization header.
+        token: The JWT token to validate.
 
     Returns:
-        The user information extracted from the token.
+        The token claims.
 
     Raises:
-        HTTPException: If the token is invalid or the user cannot be authenticated.
+        HTTPException: 401 if the token is invalid or expired, or 503 if
+            the signing keys cannot be fetched from Keycloak.
     """
     try:
-        # Validate the token through introspection
-        token_data = await validate_token(token)
-
-        # Extract user information
-        user_info = UserInfo(
-            sub=token_data.get("sub", ""),
-            email=token_data.get("email"),
-            email_verified=token_data.get("email_verified"),
-            preferred_username=token_data.get("preferred_username"),
-            name=token_data.get("name"),
-            given_name=token_data.get("given_name"),
-            family_name=token_data.get("family_name"),
-            locale=token_data.get("locale"),
-            realm_access=token_data.get("realm_access"),
-            resource_access=token_data.get("resource_access"),
+        return await verify_token(token)
+    except JWKSFetchError as e:
+        # A Keycloak outage is not the client's fault: its token may well be valid
+        logger.error("Local token verification failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication service unavailable",
         )
+    except JWTError as e:
+        logger.debug("Local token verification failed: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token is invalid or expired",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
+async def _introspect_and_cache(token: str, cache_key: str) -> Dict[str, Any]:
+    """Introspect a token and cache the result, or briefly cache its rejection."""
+    try:
+        token_data = await introspect_token(token)
+    except HTTPException as e:
+        # Replays of a token Keycloak reported inactive are answered without Keycloak
+        # for a while; Keycloak failures (503) are not cached, so the next request retries
+        if e.status_code == status.HTTP_401_UNAUTHORIZED:
+            await token_cache.set(cache_key, _REJECTED_TOKEN, ttl=settings.TOKEN_NEGATIVE_CACHE_TTL_SECONDS)
+        raise
+
+    # Never cache a result beyond the token's own expiry
+    exp = token_data.get("exp")
+    ttl = exp - time.time() if exp is not None else settings.TOKEN_CACHE_TTL_SECONDS
+    await token_cache.set(cache_key, token_data, ttl=ttl)
+
+    return token_data
 
-        return user_info
 
-    except (JWTError, HTTPException) as e:
-        if isinstance(e, HTTPException):
-            raise e
+async def _introspect_cached(token: str) -> Dict[str, Any]:
+    """Introspect a token, through the token cache."""
+    # Reuse a recent introspection result for the same token
+    cache_key = _token_cache_key(token)
+    token_data = await token_cache.get(cache_key)
+    AUTH_CACHE_LOOKUPS.labels("miss" if token_data is None else "hit").inc()
+    if token_data is not None:
+        if not token_data.get("active", False):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token is inactive or expired",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        return token_data
+
+    # Concurrent requests with the same token share one Keycloak call
+    return await introspection_calls.do(cache_key, lambda: _introspect_and_cache(token, cache_key))
+
+
+async def validate_token(token: str) -> Dict[str, Any]:
+    """
+    Validate the token using the configured validation mode.
+
+    KEYCLOAK_TOKEN_VALIDATION selects between local JWKS verification
+    ("jwks") and Keycloak token introspection ("introspection").
+    Introspection results are cached until the token expires or
+    TOKEN_CACHE_TTL_SECONDS passes, whichever comes first, and
+    rejections for TOKEN_NEGATIVE_CACHE_TTL_SECONDS. With
+    TOKEN_CACHE_URL set, the cache is shared by all workers.
+
+    Either way, tokens of sessions ended through back-channel logout
+    are rejected, even while they are cached or not yet expired.
+
+    Args:
+        token: The JWT token to validate.
+
+    Returns:
+        The token claims.
+
+    Raises:
+        HTTPException: If the token is invalid, expired or revoked.
+    """
+    if settings.KEYCLOAK_TOKEN_VALIDATION == "jwks":
+        token_data = await verify_token_locally(token)
+    else:
+        token_data = await _introspect_cached(token)
+
+    if await revocations.is_revoked(token_data):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return token_data
+
+
+async def get_token_data(
+        token: str = Depends(get_token_from_request)
+) -> Dict[str, Any]:
+    """
+    Get the validated claims of the request's token.
+
+    FastAPI caches dependency results per request, so every security
+    dependency that depends on this one shares a single validation,
+    however many of them an endpoint stacks.
+
+    Args:
+        token: The JWT token from the Authorization header.
+
+    Returns:
+        The token claims.
+
+    Raises:
+        HTTPException: If the token is invalid or expired.
+    """
+    try:
+        with timed("auth"):
+            return await validate_token(token)
+    except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -129,45 +261,113 @@ async def get_current_user(
         )
 
 
-def has_role(required_roles: List[str], require_all: bool = False):
+async def get_current_user(
+        token_data: Dict[str, Any] = Depends(get_token_data)
+) -> UserInfo:
     """
-    Dependency for requiring specific roles.
+    Get the current user from the validated token.
 
-    This creates a dependency that checks if the current user
-    has the specified role(s).
+    The token is validated once per request by get_token_data, either
+    locally against the realm's JWKS or through Keycloak's token
+    introspection endpoint, and user information is extracted from it.
 
     Args:
-        required_roles: The list of roles required for access.
-        require_all: If True, the user must have all specified roles.
-                    If False, having any one role is sufficient.
+        token_data: The validated token claims.
 
     Returns:
-        A dependency function that validates the user has the required roles.
+        The user information extracted from the token.
+
+    Raises:
+        HTTPException: If the token is invalid or the user cannot be authenticated.
     """
+    # Extract user information
+    user_info = UserInfo(
+        sub=token_data.get("sub", ""),
+        email=token_data.get("email"),
+        email_verified=token_data.get("email_verified"),
+        preferred_username=token_data.get("preferred_username"),
+        name=token_data.get("name"),
+        given_name=token_data.get("given_name"),
+        family_name=token_data.get("family_name"),
+        locale=token_data.get("locale"),
+        realm_access=token_data.get("realm_access"),
+        resource_access=token_data.get("resource_access"),
+    )
+
+    return user_info
 
-    async def _has_role(token: str = Depends(get_token_from_request)) -> bool:
-        # Validate the token and get token data
-        token_data = await validate_token(token)
 
-        # Extract realm roles
-        realm_access = token_data.get("realm_access", {})
-        user_roles = realm_access.get("roles", [])
+async def get_user_roles(
+        token_data: Dict[str, Any] = Depends(get_token_data)
+) -> UserRoles:
+    """
+    Get the current user's roles as normalized sets.
+
+    Resolved once per request and shared by every role check.
 
-        # Check roles
-        if require_all:
-            has_required_roles = all(role in user_roles for role in required_roles)
-        else:
-            has_required_roles = any(role in user_roles for role in required_roles)
+    Args:
+        token_data: The validated token claims.
+
+    Returns:
+        The user's realm and client roles.
+    """
+    return UserRoles.from_token(token_data)
 
-        if not has_required_roles:
+
+def require(policy: Policy, detail: str = "Insufficient permissions"):
+    """
+    Dependency for requiring a role policy.
+
+    The policy is compiled once, when the dependency is created, and
+    the resulting predicate is evaluated against the user's roles on
+    each request.
+
+    Args:
+        policy: The role policy, e.g. RealmRoles({"admin"}) | ClientRoles(...).
+        detail: The error detail returned when the policy is not met.
+
+    Returns:
+        A dependency function that validates the user satisfies the policy.
+    """
+    predicate = policy.compile()
+
+    async def _require(user_roles: UserRoles = Depends(get_user_roles)) -> bool:
+        if not predicate(user_roles):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail="Insufficient permissions",
+                detail=detail,
             )
-
         return True
 
-    return _has_role
+    return _require
+
+
+@lru_cache(maxsize=None)
+def _cached_requirement(policy: Policy, detail: str):
+    # Identical requirements share one dependency, so FastAPI also
+    # evaluates them once per request
+    return require(policy, detail)
+
+
+def has_role(required_roles: List[str], require_all: bool = False):
+    """
+    Dependency for requiring specific roles.
+
+    This creates a dependency that checks if the current user
+    has the specified role(s).
+
+    Args:
+        required_roles: The list of roles required for access.
+        require_all: If True, the user must have all specified roles.
+                    If False, having any one role is sufficient.
+
+    Returns:
+        A dependency function that validates the user has the required roles.
+    """
+    return _cached_requirement(
+        RealmRoles(frozenset(required_roles), require_all),
+        "Insufficient permissions",
+    )
 
 
 def has_client_role(client_id: str, required_roles: List[str], require_all: bool = False):
@@ -186,28 +386,7 @@ def has_client_role(client_id: str, required_roles: List[str], require_all: bool
     Returns:
         A dependency function that validates the user has the required client roles.
     """
-
-    async def _has_client_role(token: str = Depends(get_token_from_request)) -> bool:
-        # Validate the token and get token data
-        token_data = await validate_token(token)
-
-        # Extract client roles
-        resource_access = token_data.get("resource_access", {})
-        client_resource = resource_access.get(client_id, {})
-        user_client_roles = client_resource.get("roles", [])
-
-        # Check roles
-        if require_all:
-            has_required_roles = all(role in user_client_roles for role in required_roles)
-        else:
-            has_required_roles = any(role in user_client_roles for role in required_roles)
-
-        if not has_required_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Insufficient client permissions for {client_id}",
-            )
-
-        return True
-
-    return _has_client_role
+    return _cached_requirement(
+        ClientRoles(client_id, frozenset(required_roles), require_all),
+        f"Insufficient client permissions for {client_id}",
+    )
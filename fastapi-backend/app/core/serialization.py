@@ -0,0 +1,64 @@
+from typing import Any
+
+import pydantic_core
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+from app.core.timing import timed
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # UTC datetimes end in "Z", as Pydantic writes them
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize plain Python data to JSON bytes.
+
+    Uses orjson when installed and pydantic-core otherwise. Both handle
+    datetimes (ISO 8601) the same way as the Pydantic schemas.
+
+    Args:
+        obj: Dicts, lists and scalars.
+
+    Returns:
+        The encoded JSON.
+    """
+    with timed("serialize"):
+        if orjson is not None:
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS)
+        return pydantic_core.to_json(obj)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson or pydantic-core.
+
+    Used as the application's default response class. FastAPI has
+    already applied the response model (aliases included) by the time
+    the content is rendered, so only the final encoding changes.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_rows_response(rows: list[dict[str, Any]]) -> Response:
+    """
+    Build a JSON response straight from database rows.
+
+    Used by read-only list endpoints whose rows already have the
+    response schema's keys, skipping per-row model validation.
+
+    Args:
+        rows: The rows, as dicts keyed by the output field names.
+
+    Returns:
+        The JSON response.
+    """
+    return Response(content=dumps(rows), media_type=FastJSONResponse.media_type)
@@ -0,0 +1,149 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import Histogram
+
+# Seconds spent per phase in the current request, or None outside a timed request
+_phases: ContextVar[Dict[str, float] | None] = ContextVar("request_phases", default=None)
+
+# Latency per (route, phase), for all timed requests of this worker
+_histograms: Dict[tuple[str, str], Histogram] = {}
+_histograms_lock = threading.Lock()
+
+# Route templates by endpoint, so routes with path parameters share histograms
+_route_templates: Dict[Any, str] = {}
+
+
+def add_phase_time(phase: str, seconds: float) -> None:
+    """Add time to a phase of the current request, if it is being timed."""
+    phases = _phases.get()
+    if phases is not None:
+        phases[phase] = phases.get(phase, 0.0) + seconds
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Time a block as part of a phase of the current request.
+
+    Does nothing beyond a context variable lookup when the request is
+    not being timed.
+
+    Args:
+        phase: The phase name, e.g. "auth", "db" or "serialize".
+    """
+    phases = _phases.get()
+    if phases is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[phase] = phases.get(phase, 0.0) + time.perf_counter() - start
+
+
+def instrument_db_timing(engine: Engine) -> None:
+    """
+    Count the time of every statement on an engine towards the "db" phase.
+
+    Args:
+        engine: The sync engine (use AsyncEngine.sync_engine for async engines).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        add_phase_time("db", time.perf_counter() - conn.info["query_start_time"].pop())
+
+
+def route_template(scope: Scope) -> str:
+    """
+    Returns the path template of the route that handled a request.
+
+    Args:
+        scope: The request scope, after routing.
+
+    Returns:
+        The route's path, e.g. "/api/items/{item_id}", or "unmatched".
+    """
+    endpoint = scope.get("endpoint")
+    template = _route_templates.get(endpoint)
+    if template is None:
+        routes = scope["app"].routes if endpoint is not None else ()
+        template = next(
+            (route.path for route in routes if getattr(route, "endpoint", None) is endpoint),
+            "unmatched",
+        )
+        _route_templates[endpoint] = template
+    return template
+
+
+def _observe(route: str, phases: Dict[str, float]) -> None:
+    for phase, seconds in phases.items():
+        histogram = _histograms.get((route, phase))
+        if histogram is None:
+            with _histograms_lock:
+                histogram = _histograms.setdefault((route, phase), Histogram())
+        histogram.observe(seconds)
+
+
+def timing_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Returns the latency histograms, by route and phase."""
+    snapshot: Dict[str, Dict[str, Any]] = {}
+    for (route, phase), histogram in list(_histograms.items()):
+        snapshot.setdefault(route, {})[phase] = histogram.snapshot()
+    return snapshot
+
+
+def _server_timing(phases: Dict[str, float]) -> str:
+    return ", ".join(f"{phase};dur={seconds * 1000:.2f}" for phase, seconds in phases.items())
+
+
+class ServerTimingMiddleware:
+    """
+    Times each request by phase and reports it in a Server-Timing header.
+
+    Phases are filled in by timed() blocks and add_phase_time() calls
+    made while the request is handled; "total" covers the whole request
+    up to the response headers. After the response is sent, every phase
+    (with "total" then covering the body too) is recorded in a
+    histogram for the request's method and route template.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        phases: Dict[str, float] = {}
+        token = _phases.set(phases)
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                header_phases = {**phases, "total": time.perf_counter() - start}
+                MutableHeaders(scope=message).append("Server-Timing", _server_timing(header_phases))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            phases["total"] = time.perf_counter() - start
+            _phases.reset(token)
+            _observe(f"{scope['method']} {route_template(scope)}", phases)
@@ -1,11 +1,22 @@
 import logging
+import os
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api import api_router
 from app.config import settings
-from app.models.database import Base, engine
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_COUNT_EXACT_HEADER
+from app.core.http_client import get_keycloak_client, close_keycloak_client
+from app.core.prometheus import PrometheusMiddleware, render_metrics
+from app.core.readiness import prober
+from app.core.revocation import revocations
+from app.core.security import token_cache
+from app.core.serialization import FastJSONResponse
+from app.core.timing import ServerTimingMiddleware, timing_snapshot
+from app.models.database import Base, engine, async_engine, pool_metrics, async_pool_metrics
 
 logging.basicConfig(
     level=logging.INFO,
@@ -18,8 +29,35 @@ logger.info(settings)
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Application lifespan.
+
+    Opens the shared Keycloak HTTP client and starts the readiness
+    prober on startup. On shutdown, stops the prober and closes the
+    pooled connections of the Keycloak client, the token cache, the
+    revocation store and the async database engine.
+    """
+    get_keycloak_client()
+    prober.start()
+    yield
+    await prober.stop()
+    await close_keycloak_client()
+    await token_cache.close()
+    await revocations.close()
+    if async_engine is not None:
+        await async_engine.dispose()
+
+
 # Create FastAPI app
-app = FastAPI(title=settings.PROJECT_NAME, debug=settings.DEBUG)
+app = FastAPI(
+    title=settings.PROJECT_NAME,
+    debug=settings.DEBUG,
+    lifespan=lifespan,
+    default_response_class=FastJSONResponse,
+)
 
 # Setup CORS middleware
 app.add_middleware(
@@ -28,8 +66,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER, TOTAL_COUNT_EXACT_HEADER],
 )
 
+# Per-request phase timings; not installed at all when disabled
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Request counts and latencies for Prometheus
+if settings.PROMETHEUS_METRICS_ENABLED:
+    app.add_middleware(PrometheusMiddleware)
+
 # Include API router
 app.include_router(api_router)
 
@@ -53,6 +100,70 @@ async def health_check():
     """
     Health check endpoint.
 
-    Used for monitoring and health checks.
+    Used for monitoring and health checks. This is a liveness check:
+    it does not look at the database or Keycloak, see /ready.
     """
     return {"status": "healthy"}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness endpoint.
+
+    Returns 503 unless the database and Keycloak passed their latest
+    background probes, run every READINESS_PROBE_INTERVAL_SECONDS.
+    Answers from the cached results without any I/O, so it can be
+    polled at any frequency.
+    """
+    ready, checks = prober.status()
+    if not ready:
+        return JSONResponse(status_code=503, content={"status": "unavailable", "checks": checks})
+    return {"status": "ready", "checks": checks}
+
+
+@app.get("/internal/metrics", include_in_schema=False)
+async def internal_metrics():
+    """
+    Internal metrics endpoint.
+
+    Returns connection pool and token cache statistics for this worker
+    process, for sizing pools across workers against max_connections,
+    and per-route phase latencies if SERVER_TIMING_ENABLED is set.
+    Disabled (404) unless INTERNAL_METRICS_ENABLED is set, as it is not
+    authenticated.
+    """
+    if not settings.INTERNAL_METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    db_pools = {"sync": pool_metrics.snapshot(engine.pool)}
+    if async_engine is not None:
+        db_pools["async"] = async_pool_metrics.snapshot(async_engine.pool)
+
+    metrics = {
+        "pid": os.getpid(),
+        "db_pools": db_pools,
+        "token_cache": token_cache.stats(),
+        "revocations": revocations.stats(),
+    }
+    if settings.SERVER_TIMING_ENABLED:
+        metrics["request_phases"] = timing_snapshot()
+    return metrics
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Prometheus metrics endpoint.
+
+    Exports request, Keycloak, token cache and connection pool metrics.
+    With PROMETHEUS_MULTIPROC_DIR set, as in the production image, the
+    metrics cover all gunicorn workers, whichever worker answers.
+    Disabled (404) unless PROMETHEUS_METRICS_ENABLED is set, as it is
+    not authenticated.
+    """
+    if not settings.PROMETHEUS_METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+
+    content, media_type = render_metrics()
+    return Response(content=content, media_type=media_type)
@@ -1,20 +1,50 @@
+from typing import Any, Callable, TypeVar
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.config import settings
+from app.core.timing import instrument_db_timing
+from app.models.pool import PoolMetrics, engine_options, instrument_engine
+
+T = TypeVar("T")
+
+# Either kind of session yielded by get_db
+DbSession = Session | AsyncSession
 
 # Create SQLAlchemy engine
-engine = create_engine(settings.DATABASE_URL)
+pool_metrics = PoolMetrics("sync")
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, pool_metrics))
+instrument_engine(engine, pool_metrics)
+if settings.SERVER_TIMING_ENABLED:
+    instrument_db_timing(engine)
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factory; objects stay readable after commit without a reload
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Create async engine and session factory if enabled
+if settings.DATABASE_ASYNC:
+    async_pool_metrics = PoolMetrics("async")
+    async_engine = create_async_engine(
+        settings.get_async_database_url(),
+        **engine_options(settings.get_async_database_url(), async_pool_metrics, async_engine=True),
+    )
+    instrument_engine(async_engine.sync_engine, async_pool_metrics)
+    if settings.SERVER_TIMING_ENABLED:
+        instrument_db_timing(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+else:
+    async_pool_metrics = None
+    async_engine = None
+    AsyncSessionLocal = None
 
 # Create base class for models
 Base = declarative_base()
 
 
-def get_db():
+def get_sync_db():
     """
     Dependency function for getting a database session.
 
@@ -25,3 +55,40 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency function for getting an async database session.
+
+    Yields a session and ensures it's closed after use.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency used by the API, selected by DATABASE_ASYNC
+get_db = get_async_db if settings.DATABASE_ASYNC else get_sync_db
+
+
+async def run_db(db: DbSession, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a service method against either kind of session.
+
+    Service methods are written against a sync Session. Given an
+    AsyncSession, the method runs through AsyncSession.run_sync, so its
+    queries are awaited on the async driver instead of blocking the
+    event loop.
+
+    Args:
+        db: The session from get_db.
+        fn: The service method; it receives the sync session as its first argument.
+        *args: Positional arguments for the method.
+        **kwargs: Keyword arguments for the method.
+
+    Returns:
+        The method's return value.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return fn(db, *args, **kwargs)
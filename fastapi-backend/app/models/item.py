@@ -1,5 +1,6 @@
+from app.config import settings
 from app.models.database import Base
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import DDL, Column, DateTime, Index, Integer, String, Text, event, func, literal_column
 
 
 class Item(Base):
@@ -13,7 +14,92 @@ class Item(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), index=True)
     description = Column(Text, nullable=True)
-    owner_id = Column(String(255), index=True)  # Keycloak user ID
+    owner_id = Column(String(255))  # Keycloak user ID
+
+    # Metadata
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    version = Column(Integer, nullable=False, default=1, server_default="1")  # Incremented on every update
+
+    __table_args__ = (
+        # Serves owner-scoped listings ordered by ID, including keyset pages
+        Index("ix_items_owner_id_id", "owner_id", "id"),
+    )
 
     def __repr__(self):
         return f"<Item(id={self.id}, title={self.title}, owner_id={self.owner_id})>"
+
+
+class ItemListing(Base):
+    """
+    SQLAlchemy model for the state of each owner's item listing.
+
+    Every write to an owner's items increments the version and keeps
+    the item count, so listing ETags and counts are read from this one
+    row instead of from the items.
+    """
+    __tablename__ = "item_listings"
+
+    owner_id = Column(String(255), primary_key=True)  # Keycloak user ID
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    item_count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self):
+        return f"<ItemListing(owner_id={self.owner_id}, version={self.version}, item_count={self.item_count})>"
+
+
+def search_document():
+    """
+    Returns the PostgreSQL full-text search document of an item.
+
+    Queries must use this exact expression to be served by the
+    ix_items_search index.
+    """
+    # Inline constants rather than bind parameters, so the expression matches
+    # the index also in server-side prepared statements (asyncpg)
+    empty, space = literal_column("''"), literal_column("' '")
+    return func.to_tsvector(
+        literal_column(f"'{settings.SEARCH_TEXT_CONFIG}'::regconfig"),
+        func.coalesce(Item.title, empty).op("||")(space).op("||")(func.coalesce(Item.description, empty)),
+    )
+
+
+# PostgreSQL: GIN index for full-text search and trigram index for prefix/fuzzy title matches.
+# The full-text index is on an expression only, which Index() cannot attach to the
+# table, so it is created with DDL; its expression must stay equal to search_document()
+event.listen(
+    Item.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_items_search ON items USING gin (to_tsvector("
+        f"'{settings.SEARCH_TEXT_CONFIG}'::regconfig, "
+        "coalesce(title, '') || ' ' || coalesce(description, '')))"
+    ).execute_if(dialect="postgresql"),
+)
+Index(
+    "ix_items_title_trgm",
+    Item.title,
+    postgresql_using="gin",
+    postgresql_ops={"title": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    Item.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+# SQLite: FTS5 index kept in sync with items by triggers
+for statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS items_fts USING fts5("
+    "title, description, content='items', content_rowid='id', prefix='2 3')",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ai AFTER INSERT ON items BEGIN "
+    "INSERT INTO items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_ad AFTER DELETE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS items_fts_au AFTER UPDATE ON items BEGIN "
+    "INSERT INTO items_fts(items_fts, rowid, title, description) "
+    "VALUES ('delete', old.id, old.title, old.description); "
+    "INSERT INTO items_fts(rowid, title, description) VALUES (new.id, new.title, new.description); END",
+):
+    event.listen(Item.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
@@ -0,0 +1,156 @@
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool, AsyncAdaptedQueuePool
+
+from app.config import settings
+from app.core.metrics import Histogram
+from app.core.prometheus import DB_POOL_CHECKOUT_DURATION, DB_POOL_EVENTS, DB_POOL_IN_USE
+
+
+class PoolMetrics:
+    """
+    Connection pool statistics for one engine.
+
+    Checkout latency covers the time spent waiting for a free
+    connection, including opening a new one when the pool grows.
+    Counters and latencies are also exported to Prometheus, labelled
+    with the pool name.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.checkout_latency = Histogram()
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.connections_opened = 0
+        self.overflow_events = 0
+        self.invalidations = 0
+
+    def incr(self, name: str) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+        DB_POOL_EVENTS.labels(self.name, name).inc()
+
+    def observe_checkout(self, seconds: float) -> None:
+        self.checkout_latency.observe(seconds)
+        DB_POOL_CHECKOUT_DURATION.labels(self.name).observe(seconds)
+
+    def snapshot(self, pool: Pool) -> Dict[str, Any]:
+        """
+        Returns the pool's current usage and the counters collected so far.
+
+        Args:
+            pool: The engine's pool.
+        """
+        stats: Dict[str, Any] = {
+            "pool_class": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "connections_opened": self.connections_opened,
+            "overflow_events": self.overflow_events,
+            "invalidations": self.invalidations,
+            "checkout_latency_seconds": self.checkout_latency.snapshot(),
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                in_use=pool.checkedout(),
+                idle=pool.checkedin(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+            )
+        return stats
+
+
+class _TimedCheckout:
+    """Pool mixin that records how long each checkout waits."""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.incr("checkout_timeouts")
+            raise
+        finally:
+            self.metrics.observe_checkout(time.perf_counter() - start)
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, metrics: PoolMetrics, async_engine: bool = False) -> Dict[str, Any]:
+    """
+    Build create_engine keyword arguments from the pool settings.
+
+    The pool class is a per-engine subclass of QueuePool that reports to
+    metrics; it is kept when the engine recreates its pool. In-memory
+    SQLite keeps SQLAlchemy's default single-connection pool.
+
+    Args:
+        url: The database URL.
+        metrics: Where the pool reports its statistics.
+        async_engine: Whether the options are for create_async_engine.
+
+    Returns:
+        Keyword arguments for create_engine / create_async_engine.
+    """
+    if _is_memory_sqlite(url):
+        return {}
+
+    base = AsyncAdaptedQueuePool if async_engine else QueuePool
+    pool_class = type(f"Instrumented{base.__name__}", (_TimedCheckout, base), {"metrics": metrics})
+
+    return {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_engine(engine: Engine, metrics: PoolMetrics) -> None:
+    """
+    Register pool event listeners that feed metrics.
+
+    Listeners are attached to the engine, so they also apply to pools
+    created by engine.dispose().
+
+    Args:
+        engine: The sync engine (use AsyncEngine.sync_engine for async engines).
+        metrics: Where to record the events.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.incr("connections_opened")
+        pool = engine.pool
+        if isinstance(pool, QueuePool) and pool.overflow() > 0:
+            metrics.incr("overflow_events")
+
+    in_use = DB_POOL_IN_USE.labels(metrics.name)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.incr("checkouts")
+        in_use.inc()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        in_use.dec()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.incr("invalidations")
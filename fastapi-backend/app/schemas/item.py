@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -25,6 +28,8 @@ class ItemInDB(ItemBase):
 
     id: int
     owner_id: str
+    updated_at: datetime | None = None
+    version: int = 1
 
     class Config:
         from_attributes = True
@@ -34,3 +39,23 @@ class Item(ItemInDB):
     """Schema for public item data."""
 
     pass
+
+
+class ItemBatchUpdate(ItemUpdate):
+    """Schema for one entry of a batch update."""
+
+    id: int
+
+
+class ItemBatchDelete(BaseModel):
+    """Schema for a batch delete."""
+
+    ids: list[int]
+
+
+class ItemBatchResult(BaseModel):
+    """Schema for the outcome of one entry of a batch operation."""
+
+    id: int | None = None
+    status: Literal["created", "updated", "deleted", "not_found"]
+    item: Item | None = None
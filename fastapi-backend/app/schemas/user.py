@@ -64,6 +64,7 @@ class UserVO(BaseModel):
     profile_data: dict[str, Any] | None = None
     created_at: datetime | None = None
     updated_at: datetime | None = None
+    version: int = 1
 
     model_config = ConfigDict(
         from_attributes=True,
@@ -0,0 +1,49 @@
+from sqlalchemy import Table, func, select, text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import TTLCache
+
+# Exact whole-table counts, keyed by table name
+table_counts = TTLCache(max_size=64, max_ttl=settings.COUNT_CACHE_TTL_SECONDS)
+
+
+def _estimated_count(db: Session, table: Table) -> int | None:
+    """Returns the planner's row estimate for a PostgreSQL table, or None if unknown."""
+    estimate = db.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = CAST(:name AS regclass)"),
+        {"name": table.name},
+    ).scalar()
+
+    # -1 until the table is first vacuumed or analyzed
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def table_count(db: Session, table: Table) -> tuple[int, bool]:
+    """
+    Count all rows of a table without scanning it on every request.
+
+    On PostgreSQL, tables estimated at COUNT_ESTIMATE_THRESHOLD rows or
+    more report pg_class.reltuples, kept up to date by autovacuum.
+    Smaller tables, and other databases, get an exact COUNT(*) that is
+    cached for COUNT_CACHE_TTL_SECONDS per worker.
+
+    Args:
+        db: Database session.
+        table: The table to count.
+
+    Returns:
+        The row count, and whether it is exact.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = _estimated_count(db, table)
+        if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+            return estimate, False
+
+    count = table_counts.get(table.name)
+    if count is None:
+        count = db.execute(select(func.count()).select_from(table)).scalar_one()
+        table_counts.set(table.name, count)
+    return count, True
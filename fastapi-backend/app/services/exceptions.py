@@ -0,0 +1,11 @@
+class VersionConflictError(Exception):
+    """
+    Raised when a conditional update finds the row at a different version.
+
+    The row exists, but it was changed since the caller read it.
+    """
+
+    def __init__(self, entity: str, entity_id: int | str):
+        super().__init__(f"{entity} {entity_id} was modified since it was read")
+        self.entity = entity
+        self.entity_id = entity_id
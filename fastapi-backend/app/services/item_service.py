@@ -1,27 +1,122 @@
+from sqlalchemy import Select, and_, delete, insert, select, update
+from sqlalchemy.engine import MappingResult
 from sqlalchemy.orm import Session
 
-from app.models.item import Item
-from app.schemas.item import ItemCreate, ItemUpdate
+from app.models.item import Item, ItemListing
+from app.schemas.item import ItemCreate, ItemUpdate, ItemBatchUpdate
 from app.schemas.user import UserInfo
+from app.services.counts import table_count
+from app.services.dialects import dialect_insert
+from app.services.exceptions import VersionConflictError
+from app.services.search import apply_item_search
+
+# Columns of the Item schema, for reads that skip the ORM
+ITEM_COLUMNS = (Item.id, Item.title, Item.description, Item.owner_id, Item.updated_at, Item.version)
+
+
+def _page(stmt: Select, skip: int, limit: int, after_id: int | None) -> Select:
+    """Order a select by item ID and restrict it to one page."""
+    stmt = stmt.order_by(Item.id)
+    if after_id is not None:
+        return stmt.where(Item.id > after_id).limit(limit)
+    return stmt.offset(skip).limit(limit)
+
+
+def _owned_by(item_id: int, owner_id: str):
+    """Returns the WHERE clause matching an item owned by owner_id."""
+    return and_(Item.id == item_id, Item.owner_id == owner_id)
+
+
+def _touch_listing(db: Session, owner_id: str, count_delta: int = 0) -> None:
+    """
+    Record a write to an owner's items, without committing.
+
+    Increments the version of the owner's listing and adjusts its item
+    count, creating the listing row on the owner's first write.
+    """
+    stmt = dialect_insert(db)(ItemListing).values(owner_id=owner_id, version=1, item_count=count_delta)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[ItemListing.owner_id],
+        set_={
+            "version": ItemListing.version + 1,
+            "item_count": ItemListing.item_count + count_delta,
+        },
+    ))
+
+
+def _update_values(item_update: ItemUpdate) -> dict:
+    """Returns the columns an update sets; fields left as None are not changed."""
+    return {
+        key: value
+        for key, value in (("title", item_update.title), ("description", item_update.description))
+        if value is not None
+    }
+
+
+def _update_owned(
+        db: Session,
+        item_id: int,
+        item_update: ItemUpdate,
+        owner_id: str,
+        expected_version: int | None = None
+) -> Item | None:
+    """
+    Apply an update to an item owned by owner_id, without committing.
+
+    The update increments the item's version. With expected_version, it
+    only applies if the item is still at that version.
+
+    Raises:
+        VersionConflictError: If the item exists but is at another version.
+    """
+    condition = _owned_by(item_id, owner_id)
+    if expected_version is not None:
+        condition = and_(condition, Item.version == expected_version)
+
+    values = _update_values(item_update)
+
+    # Nothing to change, just return the item if the user owns it
+    if not values:
+        db_item = db.query(Item).filter(condition).first()
+    else:
+        db_item = db.execute(
+            update(Item).where(condition).values(**values, version=Item.version + 1).returning(Item)
+        ).scalar_one_or_none()
+
+    # Only on failure, tell a stale version apart from a missing item
+    if db_item is None and expected_version is not None:
+        if db.execute(select(Item.id).where(_owned_by(item_id, owner_id))).first() is not None:
+            raise VersionConflictError("Item", item_id)
+    return db_item
 
 
 class ItemService:
     """Service for managing items."""
 
     @staticmethod
-    def get_items(db: Session, skip: int = 0, limit: int = 100) -> list[Item] | None:
+    def get_items_rows(
+            db: Session,
+            skip: int = 0,
+            limit: int = 100,
+            after_id: int | None = None
+    ) -> list[dict]:
         """
-        Get all items.
+        Get all items as plain rows, ordered by ID.
+
+        Only the schema's columns are selected and no ORM objects are
+        built, for read-only listings.
 
         Args:
             db: Database session.
-            skip: Number of records to skip.
+            skip: Number of records to skip, ignored when after_id is given.
             limit: Maximum number of records to return.
+            after_id: Return items after this ID (keyset pagination).
 
         Returns:
-            List of items.
+            List of items as dicts.
         """
-        return db.query(Item).offset(skip).limit(limit).all()
+        stmt = _page(select(*ITEM_COLUMNS), skip, limit, after_id)
+        return [dict(row) for row in db.execute(stmt).mappings()]
 
     @staticmethod
     def get_item(db: Session, item_id: int) -> Item | None:
@@ -38,20 +133,112 @@ class ItemService:
         return db.query(Item).filter(Item.id == item_id).first()
 
     @staticmethod
-    def get_user_items(db: Session, user_id: str, skip: int = 0, limit: int = 100) -> list[Item] | None:
+    def get_item_version(db: Session, item_id: int) -> int | None:
         """
-        Get all items owned by a specific user.
+        Get the version of an item, without loading it.
+
+        Args:
+            db: Database session.
+            item_id: The ID of the item.
+
+        Returns:
+            The item's version, or None if the item does not exist.
+        """
+        return db.execute(select(Item.version).where(Item.id == item_id)).scalar_one_or_none()
+
+    @staticmethod
+    def get_user_items_version(db: Session, user_id: str) -> int:
+        """
+        Get the version of a user's item listing, without reading the items.
+
+        Every insert, update or delete of the user's items increments it.
 
         Args:
             db: Database session.
             user_id: The user ID (Keycloak sub) of the owner.
+
+        Returns:
+            The listing version, or 0 if the user never had items.
+        """
+        stmt = select(ItemListing.version).where(ItemListing.owner_id == user_id)
+        return db.execute(stmt).scalar_one_or_none() or 0
+
+    @staticmethod
+    def get_user_items_rows(
+            db: Session,
+            user_id: str,
+            skip: int = 0,
+            limit: int = 100,
+            after_id: int | None = None
+    ) -> list[dict]:
+        """
+        Get all items owned by a specific user as plain rows, ordered by ID.
+
+        Only the schema's columns are selected and no ORM objects are
+        built, for read-only listings. Served by the (owner_id, id)
+        index, so a page after a cursor costs the same however deep it is.
+
+        Args:
+            db: Database session.
+            user_id: The user ID (Keycloak sub) of the owner.
+            skip: Number of records to skip, ignored when after_id is given.
+            limit: Maximum number of records to return.
+            after_id: Return items after this ID (keyset pagination).
+
+        Returns:
+            List of items owned by the user as dicts.
+        """
+        stmt = _page(select(*ITEM_COLUMNS).where(Item.owner_id == user_id), skip, limit, after_id)
+        return [dict(row) for row in db.execute(stmt).mappings()]
+
+    @staticmethod
+    def count_items(db: Session, owner_id: str | None = None) -> tuple[int, bool]:
+        """
+        Count items, of one owner or in total.
+
+        An owner's items are counted exactly, from the count kept in
+        their listing row. The total over all items may be cached or
+        estimated, see table_count.
+
+        Args:
+            db: Database session.
+            owner_id: Only count this user's items, or all items if None.
+
+        Returns:
+            The number of items, and whether it is exact.
+        """
+        if owner_id is None:
+            return table_count(db, Item.__table__)
+
+        stmt = select(ItemListing.item_count).where(ItemListing.owner_id == owner_id)
+        return db.execute(stmt).scalar_one_or_none() or 0, True
+
+    @staticmethod
+    def search_items_rows(
+            db: Session,
+            query: str,
+            owner_id: str | None = None,
+            skip: int = 0,
+            limit: int = 100
+    ) -> list[dict]:
+        """
+        Search items by title and description, best matches first.
+
+        Args:
+            db: Database session.
+            query: The search text; the last word also matches as a prefix.
+            owner_id: Only search this user's items, or all items if None.
             skip: Number of records to skip.
             limit: Maximum number of records to return.
 
         Returns:
-            List of items owned by the user.
+            List of matching items as dicts.
         """
-        return db.query(Item).filter(Item.owner_id == user_id).offset(skip).limit(limit).all()
+        stmt = select(*ITEM_COLUMNS)
+        if owner_id is not None:
+            stmt = stmt.where(Item.owner_id == owner_id)
+        stmt = apply_item_search(db, stmt, query).offset(skip).limit(limit)
+        return [dict(row) for row in db.execute(stmt).mappings()]
 
     @staticmethod
     def create_item(db: Session, item: ItemCreate, owner_id: str) -> Item:
@@ -68,6 +255,7 @@ class ItemService:
         """
         db_item = Item(title=item.title, description=item.description, owner_id=owner_id)
         db.add(db_item)
+        _touch_listing(db, owner_id, 1)
         db.commit()
         db.refresh(db_item)
         return db_item
@@ -77,37 +265,35 @@ class ItemService:
             db: Session,
             item_id: int,
             item_update: ItemUpdate,
-            current_user: UserInfo
+            current_user: UserInfo,
+            expected_version: int | None = None
     ) -> Item | None:
         """
         Update an item if the current user is the owner.
 
+        The ownership check, the optional version check and the write
+        are a single UPDATE ... WHERE id AND owner_id [AND version] ...
+        RETURNING statement, so there is no separate read, no row lock
+        held across requests and no window between check and write.
+
         Args:
             db: Database session.
             item_id: The ID of the item to update.
             item_update: The updated item data.
             current_user: The current authenticated user.
+            expected_version: Only update the item if it is at this version.
 
         Returns:
-            The updated item if successful, None otherwise.
-        """
-        db_item = ItemService.get_item(db, item_id)
-
-        if db_item is None:
-            return None
-
-        # Check if the current user is the owner
-        if db_item.owner_id != current_user.sub:
-            return None
-
-        # Update the item
-        if item_update.title is not None:
-            db_item.title = item_update.title
-        if item_update.description is not None:
-            db_item.description = item_update.description
+            The updated item if successful, None if it does not exist
+            or is owned by someone else.
 
+        Raises:
+            VersionConflictError: If the item is not at expected_version.
+        """
+        db_item = _update_owned(db, item_id, item_update, current_user.sub, expected_version)
+        if db_item is not None and _update_values(item_update):
+            _touch_listing(db, current_user.sub)
         db.commit()
-        db.refresh(db_item)
         return db_item
 
     @staticmethod
@@ -115,24 +301,127 @@ class ItemService:
         """
         Delete an item if the current user is the owner.
 
+        Runs as a single ownership-scoped DELETE ... RETURNING statement.
+
         Args:
             db: Database session.
             item_id: The ID of the item to delete.
             current_user: The current authenticated user.
 
         Returns:
-            True if the item was deleted, False otherwise.
+            True if the item was deleted, False if it does not exist
+            or is owned by someone else.
+        """
+        deleted_id = db.execute(
+            delete(Item).where(_owned_by(item_id, current_user.sub)).returning(Item.id)
+        ).scalar_one_or_none()
+        if deleted_id is not None:
+            _touch_listing(db, current_user.sub, -1)
+
+        db.commit()
+        return deleted_id is not None
+
+    @staticmethod
+    def create_items(db: Session, items: list[ItemCreate], owner_id: str) -> list[Item]:
+        """
+        Create several items in one transaction.
+
+        The rows are written with a multi-row INSERT ... RETURNING.
+
+        Args:
+            db: Database session.
+            items: The item data.
+            owner_id: The user ID (Keycloak sub) of the owner.
+
+        Returns:
+            The created items, in the order given.
+        """
+        if not items:
+            return []
+
+        db_items = db.scalars(
+            insert(Item).returning(Item, sort_by_parameter_order=True),
+            [{"title": item.title, "description": item.description, "owner_id": owner_id} for item in items],
+        ).all()
+        _touch_listing(db, owner_id, len(db_items))
+
+        db.commit()
+        return list(db_items)
+
+    @staticmethod
+    def update_items(db: Session, item_updates: list[ItemBatchUpdate], current_user: UserInfo) -> list[Item | None]:
+        """
+        Update several items in one transaction.
+
+        Each update is an ownership-scoped UPDATE ... RETURNING that
+        increments the item's version, as in update_item; items that do
+        not exist or belong to someone else are skipped.
+
+        Args:
+            db: Database session.
+            item_updates: The updates, each with the ID of its item.
+            current_user: The current authenticated user.
+
+        Returns:
+            For each update, in order, the updated item or None.
         """
-        db_item = ItemService.get_item(db, item_id)
+        db_items = [
+            _update_owned(db, item_update.id, item_update, current_user.sub)
+            for item_update in item_updates
+        ]
+        if any(db_item is not None and _update_values(u) for db_item, u in zip(db_items, item_updates)):
+            _touch_listing(db, current_user.sub)
+
+        db.commit()
+        return db_items
+
+    @staticmethod
+    def delete_items(db: Session, item_ids: list[int], current_user: UserInfo) -> set[int]:
+        """
+        Delete several items owned by the current user.
+
+        Runs as a single ownership-scoped DELETE ... RETURNING statement.
+
+        Args:
+            db: Database session.
+            item_ids: The IDs of the items to delete.
+            current_user: The current authenticated user.
 
-        if db_item is None:
-            return False
+        Returns:
+            The IDs of the items that were deleted.
+        """
+        if not item_ids:
+            return set()
 
-        # Check if the current user is the owner
-        if db_item.owner_id != current_user.sub:
-            return False
+        deleted_ids = db.scalars(
+            delete(Item)
+            .where(Item.id.in_(item_ids), Item.owner_id == current_user.sub)
+            .returning(Item.id)
+        ).all()
+        if deleted_ids:
+            _touch_listing(db, current_user.sub, -len(deleted_ids))
 
-        # Delete the item
-        db.delete(db_item)
         db.commit()
-        return True
+        return set(deleted_ids)
+
+    @staticmethod
+    def stream_items(db: Session, batch_size: int = 1000) -> MappingResult:
+        """
+        Stream all items as plain rows, ordered by ID.
+
+        Rows are read through a server-side cursor batch_size at a time
+        and are not loaded as ORM objects.
+
+        Args:
+            db: Database session.
+            batch_size: Number of rows fetched per round-trip.
+
+        Returns:
+            The rows, as mappings of column name to value.
+        """
+        stmt = (
+            select(*ITEM_COLUMNS)
+            .order_by(Item.id)
+            .execution_options(yield_per=batch_size)
+        )
+        return db.execute(stmt).mappings()
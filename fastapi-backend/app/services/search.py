@@ -0,0 +1,74 @@
+import re
+
+from sqlalchemy import Select, column, false, func, literal_column, table
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.item import Item, search_document
+
+# SQLite FTS5 index created alongside the items table
+_items_fts = table("items_fts", column("rowid"))
+_items_fts_match = literal_column("items_fts")
+
+
+def _search_terms(query: str) -> list[str]:
+    """Split a search query into words, dropping query-syntax characters."""
+    return re.findall(r"\w+", query)
+
+
+def _postgresql_search(stmt: Select, query: str, terms: list[str]) -> Select:
+    # Every word must match, the last one as a prefix, as in search-as-you-type
+    tsquery_text = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    tsquery = func.to_tsquery(literal_column(f"'{settings.SEARCH_TEXT_CONFIG}'::regconfig"), tsquery_text)
+    document = search_document()
+
+    return (
+        stmt.where(document.op("@@")(tsquery) | Item.title.op("%")(query))
+        .order_by(
+            (func.ts_rank(document, tsquery) + func.similarity(Item.title, query)).desc(),
+            Item.id,
+        )
+    )
+
+
+def _sqlite_search(stmt: Select, terms: list[str]) -> Select:
+    # Every word must match, the last one as a prefix
+    match = " ".join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+
+    return (
+        stmt.join(_items_fts, _items_fts.c.rowid == Item.id)
+        .where(_items_fts_match.op("MATCH")(match))
+        .order_by(func.bm25(_items_fts_match), Item.id)
+    )
+
+
+def apply_item_search(db: Session, stmt: Select, query: str) -> Select:
+    """
+    Restrict an item select to matches for a search query, best first.
+
+    PostgreSQL matches the title and description against the
+    ix_items_search full-text index, plus fuzzy title matches through
+    the ix_items_title_trgm trigram index, ranked by ts_rank and
+    similarity. SQLite uses the items_fts FTS5 table ranked by bm25.
+
+    Args:
+        db: Database session, used to pick the dialect.
+        stmt: A select over the items table.
+        query: The user's search text.
+
+    Returns:
+        The select, filtered and ordered by relevance.
+
+    Raises:
+        NotImplementedError: If the database is neither PostgreSQL nor SQLite.
+    """
+    terms = _search_terms(query)
+    if not terms:
+        return stmt.where(false())
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        return _postgresql_search(stmt, query, terms)
+    if dialect == "sqlite":
+        return _sqlite_search(stmt, terms)
+    raise NotImplementedError(f"Item search is not supported for {dialect}")
@@ -1,9 +1,43 @@
-from typing import List
+import hashlib
 
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.engine import MappingResult
 from sqlalchemy.orm import Session
 
+from app.config import settings
+from app.core.cache import TTLCache
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserInfo
+from app.services.counts import table_count
+from app.services.dialects import dialect_insert
+from app.services.exceptions import VersionConflictError
+
+# Columns of the UserVO schema, labelled with its aliases, for reads that skip the ORM
+USER_VO_COLUMNS = (
+    User.id,
+    User.username,
+    User.email,
+    User.company,
+    User.position,
+    User.phone,
+    User.address,
+    User.profile_data.label("profileData"),
+    User.created_at.label("createdAt"),
+    User.updated_at.label("updatedAt"),
+    User.version,
+)
+
+# Fingerprint of the Keycloak identity last written for each user, keyed by sub.
+# Per worker: update_user clears it only here (see USER_SYNC_CACHE_TTL_SECONDS)
+synced_users = TTLCache(
+    max_size=settings.USER_SYNC_CACHE_MAX_SIZE,
+    max_ttl=settings.USER_SYNC_CACHE_TTL_SECONDS,
+)
+
+
+def _identity_fingerprint(username: str | None, email: str | None) -> str:
+    """Returns a compact fingerprint of the Keycloak-sourced user fields."""
+    return hashlib.blake2b(f"{username}\0{email}".encode(), digest_size=8).hexdigest()
 
 
 class UserService:
@@ -23,6 +57,20 @@ class UserService:
         """
         return db.query(User).filter(User.id == user_id).first()
 
+    @staticmethod
+    def get_user_version(db: Session, user_id: str) -> int | None:
+        """
+        Get the version of a user, without loading it.
+
+        Args:
+            db: Database session.
+            user_id: The user ID (Keycloak sub).
+
+        Returns:
+            The user's version, or None if the user does not exist.
+        """
+        return db.execute(select(User.version).where(User.id == user_id)).scalar_one_or_none()
+
     @staticmethod
     def get_user_by_username(db: Session, username: str) -> User | None:
         """
@@ -54,19 +102,64 @@ class UserService:
         return db.query(User).filter(User.email == email).first()
 
     @staticmethod
-    def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
+    def get_users_rows(db: Session, skip: int = 0, limit: int = 100, after_id: str | None = None) -> list[dict]:
         """
-        Get all users.
+        Get all users as plain rows, ordered by ID.
+
+        Only the UserVO columns are selected, keyed by their aliases,
+        and no ORM objects are built.
 
         Args:
             db: Database session.
-            skip: Number of records to skip.
+            skip: Number of records to skip, ignored when after_id is given.
             limit: Maximum number of records to return.
+            after_id: Return users after this ID (keyset pagination).
+
+        Returns:
+            List of users as dicts.
+        """
+        stmt = select(*USER_VO_COLUMNS).order_by(User.id)
+        if after_id is not None:
+            stmt = stmt.where(User.id > after_id).limit(limit)
+        else:
+            stmt = stmt.offset(skip).limit(limit)
+        return [dict(row) for row in db.execute(stmt).mappings()]
+
+    @staticmethod
+    def count_users(db: Session) -> tuple[int, bool]:
+        """
+        Count all users, possibly from a cache or an estimate, see table_count.
+
+        Args:
+            db: Database session.
+
+        Returns:
+            The number of users, and whether it is exact.
+        """
+        return table_count(db, User.__table__)
+
+    @staticmethod
+    def stream_users(db: Session, batch_size: int = 1000) -> MappingResult:
+        """
+        Stream all users as plain rows, ordered by ID.
+
+        Rows are read through a server-side cursor batch_size at a time
+        and are not loaded as ORM objects. Columns are labelled like the
+        UserVO aliases.
+
+        Args:
+            db: Database session.
+            batch_size: Number of rows fetched per round-trip.
 
         Returns:
-            List of users.
+            The rows, as mappings of column name to value.
         """
-        return db.query(User).offset(skip).limit(limit).all()
+        stmt = (
+            select(*USER_VO_COLUMNS)
+            .order_by(User.id)
+            .execution_options(yield_per=batch_size)
+        )
+        return db.execute(stmt).mappings()
 
     @staticmethod
     def create_user(db: Session, user: UserCreate) -> User:
@@ -96,30 +189,57 @@ class UserService:
         return db_user
 
     @staticmethod
-    def update_user(db: Session, user_id: str, user_update: UserUpdate) -> User | None:
+    def update_user(
+            db: Session,
+            user_id: str,
+            user_update: UserUpdate,
+            expected_version: int | None = None
+    ) -> User | None:
         """
         Update a user.
 
+        The update is a single UPDATE ... WHERE id [AND version] ...
+        RETURNING statement that increments the user's version, so
+        concurrent updates cannot silently overwrite each other when
+        expected_version is given.
+
         Args:
             db: Database session.
             user_id: The user ID (Keycloak sub).
             user_update: The updated user data.
+            expected_version: Only update the user if it is at this version.
 
         Returns:
             The updated user if found, None otherwise.
+
+        Raises:
+            VersionConflictError: If the user is not at expected_version.
         """
-        db_user = UserService.get_user(db, user_id)
+        condition = User.id == user_id
+        if expected_version is not None:
+            condition = and_(condition, User.version == expected_version)
+
+        # Update fields if provided
+        update_data = user_update.model_dump(exclude_unset=True)
+        if update_data:
+            db_user = db.execute(
+                update(User).where(condition).values(**update_data, version=User.version + 1).returning(User),
+                execution_options={"populate_existing": True},
+            ).scalar_one_or_none()
+        else:
+            db_user = db.query(User).filter(condition).first()
 
         if db_user is None:
+            # Only on failure, tell a stale version apart from a missing user
+            if expected_version is not None and UserService.get_user_version(db, user_id) is not None:
+                raise VersionConflictError("User", user_id)
             return None
 
-        # Update fields if provided
-        update_data = user_update.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_user, key, value)
+        # The row no longer matches what was synced from Keycloak
+        if "username" in update_data or "email" in update_data:
+            synced_users.delete(user_id)
 
         db.commit()
-        db.refresh(db_user)
         return db_user
 
     @staticmethod
@@ -130,6 +250,11 @@ class UserService:
         This creates or updates a user based on Keycloak information.
         It ensures that the application database is in sync with Keycloak.
 
+        A single INSERT ... ON CONFLICT (id) DO UPDATE ... WHERE statement
+        inserts new users and only updates existing ones whose username or
+        email changed, so an unchanged user costs no write and keeps its
+        updated_at.
+
         Args:
             db: Database session.
             keycloak_user_info: User information from Keycloak.
@@ -137,21 +262,52 @@ class UserService:
         Returns:
             The synchronized user.
         """
-        # Check if user exists
-        db_user = UserService.get_user(db, keycloak_user_info.sub)
+        username = keycloak_user_info.preferred_username or "unknown"
+        insert = dialect_insert(db)
+        stmt = insert(User).values(
+            id=keycloak_user_info.sub,
+            username=username,
+            email=keycloak_user_info.email,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[User.id],
+            set_={
+                "username": stmt.excluded.username,
+                "email": stmt.excluded.email,
+                "updated_at": func.now(),
+                "version": User.version + 1,
+            },
+            where=or_(
+                User.username.is_distinct_from(stmt.excluded.username),
+                User.email.is_distinct_from(stmt.excluded.email),
+            ),
+        ).returning(User)
 
-        if db_user:
-            # Update existing user with Keycloak data
-            update_data = UserUpdate(
-                username=keycloak_user_info.preferred_username,
-                email=keycloak_user_info.email,
-            )
-            return UserService.update_user(db, keycloak_user_info.sub, update_data)
+        db_user = db.execute(stmt, execution_options={"populate_existing": True}).scalar_one_or_none()
+        if db_user is not None:
+            db.commit()
         else:
-            # Create new user from Keycloak data
-            user_data = UserCreate(
-                id=keycloak_user_info.sub,
-                username=keycloak_user_info.preferred_username or "unknown",
-                email=keycloak_user_info.email,
-            )
-            return UserService.create_user(db, user_data)
+            # The user exists and is unchanged: nothing was written or returned
+            db_user = UserService.get_user(db, keycloak_user_info.sub)
+
+        synced_users.set(keycloak_user_info.sub, _identity_fingerprint(username, keycloak_user_info.email))
+        return db_user
+
+    @staticmethod
+    def is_synced(keycloak_user_info: UserInfo) -> bool:
+        """
+        Check whether a user's Keycloak identity was recently synced unchanged.
+
+        This is a per-worker, in-memory check that needs no database access.
+
+        Args:
+            keycloak_user_info: User information from Keycloak.
+
+        Returns:
+            True if sync_user can be skipped for this user.
+        """
+        fingerprint = _identity_fingerprint(
+            keycloak_user_info.preferred_username or "unknown",
+            keycloak_user_info.email,
+        )
+        return synced_users.get(keycloak_user_info.sub) == fingerprint
@@ -0,0 +1,124 @@
+"""
+Endpoint throughput under a slow query: sync sessions vs. DATABASE_ASYNC.
+
+Serves an endpoint that runs one slow query through get_db and run_db,
+as the API endpoints do, and sends it concurrent requests in-process.
+The query sleeps inside SQLite (a registered bench_sleep function), so
+it stands in for a slow query on any database. Each mode runs in its
+own process, since DATABASE_ASYNC is read at import time:
+
+- "sync": the service method runs on a sync Session and blocks the
+  event loop for the whole query.
+- "async": the same method runs through AsyncSession.run_sync on
+  aiosqlite, so the event loop keeps serving other requests.
+
+Keep the concurrency within DB_POOL_SIZE + DB_MAX_OVERFLOW. Above that,
+the sync mode stalls: a request blocks the event loop waiting for a
+pooled connection, and the requests holding connections need the event
+loop to return them. Requests then fail after DB_POOL_TIMEOUT_SECONDS.
+
+Usage (from fastapi-backend):
+
+    python -m benchmarks.async_db --requests 100 --concurrency 10 --query-time 0.05
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("KEYCLOAK_SERVER_URL", "http://127.0.0.1:1")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "backend-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+
+
+def _register_sleep(engine, query_time: float) -> None:
+    """Make SELECT bench_sleep() take query_time seconds on every connection of an engine."""
+    from sqlalchemy import event
+
+    def bench_sleep() -> int:
+        time.sleep(query_time)
+        return 1
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        dbapi_connection.create_function("bench_sleep", 0, bench_sleep)
+
+
+async def measure(total: int, concurrency: int, query_time: float) -> float:
+    """Send total requests, at most concurrency at a time; returns requests per second."""
+    import httpx
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import text
+    from sqlalchemy.orm import Session
+
+    from app.models.database import DbSession, async_engine, engine, get_db, run_db
+
+    _register_sleep(engine, query_time)
+    if async_engine is not None:
+        _register_sleep(async_engine.sync_engine, query_time)
+
+    def slow_query(db: Session) -> int:
+        return db.execute(text("SELECT bench_sleep()")).scalar_one()
+
+    app = FastAPI()
+
+    @app.get("/slow")
+    async def slow(db: DbSession = Depends(get_db)):
+        return {"result": await run_db(db, slow_query)}
+
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get("/slow")
+                response.raise_for_status()
+
+        # Warm up the connection pool
+        await asyncio.gather(*(one() for _ in range(concurrency)))
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+    if async_engine is not None:
+        await async_engine.dispose()
+    return total / elapsed
+
+
+def run_mode(mode: str, args: argparse.Namespace, database_url: str) -> float:
+    """Run the measurement for one mode in a child process."""
+    env = {**os.environ, "DATABASE_URL": database_url, "DATABASE_ASYNC": str(mode == "async").lower()}
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.async_db", "--child",
+         "--requests", str(args.requests), "--concurrency", str(args.concurrency),
+         "--query-time", str(args.query_time)],
+        env=env, check=True, capture_output=True, text=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100, help="Total requests per mode")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent requests, at most the pool size")
+    parser.add_argument("--query-time", type=float, default=0.05, help="Duration of the slow query in seconds")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(asyncio.run(measure(args.requests, args.concurrency, args.query_time)))
+        sys.exit()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        sync_rate = run_mode("sync", args, database_url)
+        async_rate = run_mode("async", args, database_url)
+
+    print(f"sync Session:          {sync_rate:8.1f} req/s")
+    print(f"DATABASE_ASYNC=true:   {async_rate:8.1f} req/s  ({async_rate / sync_rate:.1f}x)")
+    print(f"(query time {args.query_time * 1000:.0f} ms, concurrency {args.concurrency})")
@@ -0,0 +1,68 @@
+"""
+Creating many items: one POST per item vs. one batch request.
+
+Runs the application in-process against a SQLite database file, with
+authentication replaced by a fixed user, and creates the same items two
+ways:
+
+- "single": POST /api/items once per item, each with its own commit
+  and refresh.
+- "batch": POST /api/items/batch in requests of up to
+  ITEM_BATCH_MAX_SIZE items, each one multi-row INSERT ... RETURNING
+  and one commit.
+
+Usage (from fastapi-backend):
+
+    python -m benchmarks.batch_insert --items 1000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+OWNER = "bench-user"
+
+
+async def measure(total: int) -> None:
+    import httpx
+
+    from app.config import settings
+    from app.core.security import get_current_user
+    from app.main import app
+    from app.schemas.user import UserInfo
+
+    app.dependency_overrides[get_current_user] = lambda: UserInfo(sub=OWNER, preferred_username="bench")
+    items = [{"title": f"Item {i}", "description": f"Description of item {i}"} for i in range(total)]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        start = time.perf_counter()
+        for item in items:
+            (await client.post("/api/items", json=item)).raise_for_status()
+        single = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for i in range(0, total, settings.ITEM_BATCH_MAX_SIZE):
+            (await client.post("/api/items/batch", json=items[i:i + settings.ITEM_BATCH_MAX_SIZE])).raise_for_status()
+        batch = time.perf_counter() - start
+
+        created = int((await client.get("/api/items/me", params={"limit": 1})).headers["X-Total-Count"])
+        assert created == 2 * total, f"Expected {2 * total} items, found {created}"
+
+    print(f"{total} single POSTs: {single * 1000:8.1f} ms")
+    print(f"batch POSTs:        {batch * 1000:8.1f} ms  ({single / batch:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1000, help="Items created each way")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("KEYCLOAK_SERVER_URL", "http://127.0.0.1:1")
+        os.environ.setdefault("KEYCLOAK_REALM", "bench")
+        os.environ.setdefault("KEYCLOAK_CLIENT_ID", "backend-client")
+        os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+        asyncio.run(measure(args.items))
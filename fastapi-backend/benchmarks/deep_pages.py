@@ -0,0 +1,106 @@
+"""
+Deep-page latency: OFFSET vs. keyset (cursor) pagination.
+
+Seeds a SQLite database with items of a few owners, then reads one
+page at increasing depths of one owner's items and of all items, two
+ways:
+
+- "OFFSET": get_user_items_rows / get_items_rows with skip, which
+  reads and discards every row before the page.
+- "keyset": the same methods with after_id, as a cursor from
+  X-Next-Cursor gives, which seeks straight to the page through the
+  primary key or the (owner_id, id) index.
+
+Both return the same rows, which is checked before timing.
+
+Usage (from fastapi-backend):
+
+    python -m benchmarks.deep_pages --items 1000000 --depths 1000 10000 100000 400000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("KEYCLOAK_SERVER_URL", "http://127.0.0.1:1")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "backend-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+
+OWNER = "owner-0"
+
+
+def seed(engine, total: int, owners: int) -> None:
+    """Insert total items in batches, spread round-robin over owners."""
+    from sqlalchemy import insert
+
+    from app.models.item import Item
+
+    batch = 50_000
+    for start in range(0, total, batch):
+        with engine.begin() as conn:
+            conn.execute(insert(Item), [
+                {"title": f"Item {i}", "description": f"Description of item {i}", "owner_id": f"owner-{i % owners}"}
+                for i in range(start, min(start + batch, total))
+            ])
+
+
+def timed_ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main(args: argparse.Namespace, path: str) -> None:
+    from sqlalchemy import create_engine, select
+    from sqlalchemy.orm import Session
+
+    from app.models.database import Base
+    from app.models.item import Item
+    from app.services.item_service import ItemService
+
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    seed(engine, args.items, args.owners)
+
+    with Session(engine) as db:
+        scopes = {
+            "owner": (ItemService.get_user_items_rows, {"user_id": OWNER}, Item.owner_id == OWNER),
+            "all": (ItemService.get_items_rows, {}, True),
+        }
+        for scope, (method, kwargs, condition) in scopes.items():
+            for depth in args.depths:
+                # The ID a cursor would carry: the last one on the previous page
+                after_id = db.execute(
+                    select(Item.id).where(condition).order_by(Item.id).offset(depth - 1).limit(1)
+                ).scalar_one_or_none()
+                if after_id is None:
+                    continue
+
+                def offset_page():
+                    return method(db, skip=depth, limit=args.limit, **kwargs)
+
+                def keyset_page():
+                    return method(db, after_id=after_id, limit=args.limit, **kwargs)
+
+                assert offset_page() == keyset_page(), "The pages differ"
+                offset_ms = timed_ms(offset_page, args.repeat)
+                keyset_ms = timed_ms(keyset_page, args.repeat)
+                print(f"{scope:5s}  depth {depth:9,d}   OFFSET: {offset_ms:8.2f} ms"
+                      f"   keyset: {keyset_ms:6.2f} ms  ({offset_ms / keyset_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=1_000_000, help="Items to seed")
+    parser.add_argument("--owners", type=int, default=2, help="Owners the items are spread over")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1_000, 10_000, 100_000, 400_000],
+                        help="Rows before the page")
+    parser.add_argument("--limit", type=int, default=100, help="Rows per page")
+    parser.add_argument("--repeat", type=int, default=5, help="Reads per page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        main(args, os.path.join(tmp, "bench.db"))
@@ -0,0 +1,86 @@
+"""
+/api/items/me throughput: stdlib JSONResponse vs. the orjson encoder.
+
+Runs the application's /api/items/me endpoint in-process against a
+seeded SQLite database, with authentication replaced by a fixed user,
+and renders its rows two ways:
+
+- "JSONResponse": jsonable_encoder plus stdlib json, as FastAPI's
+  default JSONResponse renders them.
+- "FastJSONResponse": app.core.serialization.dumps (orjson if
+  installed), as the endpoint does now.
+
+Both give the same JSON, which is checked before timing.
+
+Usage (from fastapi-backend):
+
+    python -m benchmarks.json_response --requests 200 --limit 100 500
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+OWNER = "bench-user"
+
+
+async def measure(total: int, limits: list[int]) -> None:
+    """Request each page size total times with both encoders and print the throughputs."""
+    import httpx
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+    from sqlalchemy import insert
+
+    from app.api import items
+    from app.core.security import get_current_user
+    from app.main import app
+    from app.models.database import engine
+    from app.models.item import Item
+    from app.schemas.user import UserInfo
+
+    with engine.begin() as conn:
+        conn.execute(insert(Item), [
+            {"title": f"Item {i}", "description": f"Description of item {i}", "owner_id": OWNER}
+            for i in range(max(limits))
+        ])
+    app.dependency_overrides[get_current_user] = lambda: UserInfo(sub=OWNER, preferred_username="bench")
+
+    encoders = {
+        "JSONResponse": lambda rows: JSONResponse(jsonable_encoder(rows)),
+        "FastJSONResponse": items.json_rows_response,
+    }
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for limit in limits:
+            bodies, rates = {}, {}
+            for name, encoder in encoders.items():
+                items.json_rows_response = encoder
+                bodies[name] = (await client.get("/api/items/me", params={"limit": limit})).json()
+
+                start = time.perf_counter()
+                for _ in range(total):
+                    (await client.get("/api/items/me", params={"limit": limit})).raise_for_status()
+                rates[name] = total / (time.perf_counter() - start)
+            items.json_rows_response = encoders["FastJSONResponse"]
+
+            assert bodies["JSONResponse"] == bodies["FastJSONResponse"], "The encoders disagree"
+            print(f"{limit:5d} items  JSONResponse: {rates['JSONResponse']:7.1f} req/s"
+                  f"   FastJSONResponse: {rates['FastJSONResponse']:7.1f} req/s"
+                  f"  ({rates['FastJSONResponse'] / rates['JSONResponse']:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per encoder and page size")
+    parser.add_argument("--limit", type=int, nargs="+", default=[100, 500], help="Items per page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+        os.environ.setdefault("KEYCLOAK_SERVER_URL", "http://127.0.0.1:1")
+        os.environ.setdefault("KEYCLOAK_REALM", "bench")
+        os.environ.setdefault("KEYCLOAK_CLIENT_ID", "backend-client")
+        os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+        asyncio.run(measure(args.requests, args.limit))
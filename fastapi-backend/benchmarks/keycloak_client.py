@@ -0,0 +1,109 @@
+"""
+Introspection throughput: blocking requests vs. the shared async client.
+
+Starts a stub Keycloak on localhost that answers introspection requests
+after a fixed delay, then validates distinct tokens (so no cache helps)
+from concurrent coroutines on one event loop, as one worker would:
+
+- "blocking": the original implementation, requests.post inside an
+  async function, which stalls the event loop for every call.
+- "async": app.core.security.introspect_token over the shared
+  httpx.AsyncClient.
+
+Usage (from fastapi-backend):
+
+    python -m benchmarks.keycloak_client --requests 200 --concurrency 50 --latency 0.02
+"""
+import argparse
+import asyncio
+import os
+import socket
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "backend-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_stub_keycloak(port: int, latency: float) -> None:
+    """Run a stub Keycloak introspection endpoint in a background thread."""
+    import uvicorn
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    async def introspect(request):
+        await asyncio.sleep(latency)
+        return JSONResponse({"active": True, "sub": "bench-user", "exp": time.time() + 300})
+
+    app = Starlette(routes=[
+        Route("/realms/{realm}/protocol/openid-connect/token/introspect", introspect, methods=["POST"]),
+    ])
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+
+
+async def blocking_introspect(token: str) -> dict:
+    """The introspection call as it was before the async client: a blocking requests.post."""
+    import requests
+    from app.config import settings
+
+    response = requests.post(
+        settings.get_keycloak_introspection_endpoint(),
+        data={"token": token, "token_type_hint": "access_token"},
+        auth=(settings.KEYCLOAK_CLIENT_ID, settings.KEYCLOAK_CLIENT_SECRET),
+    )
+    return response.json()
+
+
+async def run(introspect, total: int, concurrency: int) -> float:
+    """Validate total distinct tokens with at most concurrency in flight; returns requests per second."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            token_data = await introspect(f"token-{i}")
+            assert token_data["active"]
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return total / (time.perf_counter() - start)
+
+
+async def main(total: int, concurrency: int) -> None:
+    from app.core.http_client import close_keycloak_client
+    from app.core.security import introspect_token
+
+    # Warm up connections on both paths
+    await run(blocking_introspect, concurrency, concurrency)
+    await run(introspect_token, concurrency, concurrency)
+
+    blocking = await run(blocking_introspect, total, concurrency)
+    pooled = await run(introspect_token, total, concurrency)
+    await close_keycloak_client()
+
+    print(f"blocking requests.post: {blocking:8.1f} req/s")
+    print(f"shared async client:    {pooled:8.1f} req/s  ({pooled / blocking:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="Total introspections per run")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent requests on the event loop")
+    parser.add_argument("--latency", type=float, default=0.02, help="Stub Keycloak response delay in seconds")
+    args = parser.parse_args()
+
+    port = _free_port()
+    os.environ["KEYCLOAK_SERVER_URL"] = f"http://127.0.0.1:{port}"
+    start_stub_keycloak(port, args.latency)
+    asyncio.run(main(args.requests, args.concurrency))
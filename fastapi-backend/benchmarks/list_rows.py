@@ -0,0 +1,117 @@
+"""
+List endpoint latency: ORM objects + response_model vs. Core rows.
+
+Seeds a SQLite database with one owner's items, then serves a page of
+them in-process through two endpoints:
+
+- "orm": the original path, ORM Item objects returned through
+  response_model=List[Item], validated per row and encoded with
+  JSONResponse.
+- "rows": ItemService.get_user_items_rows encoded by json_rows_response,
+  as the list endpoints do now.
+
+Both endpoints return the same JSON, which is checked before timing.
+
+Usage (from fastapi-backend):
+
+    python -m benchmarks.list_rows --requests 200 --page-sizes 100 1000
+"""
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("KEYCLOAK_SERVER_URL", "http://127.0.0.1:1")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "backend-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+
+OWNER = "bench-user"
+
+
+def seed(database_url: str, count: int):
+    """Create the schema and count items of OWNER; returns a session factory."""
+    from sqlalchemy import create_engine, insert
+    from sqlalchemy.orm import sessionmaker
+
+    from app.models.database import Base
+    from app.models.item import Item
+
+    engine = create_engine(database_url)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Item), [
+            {"title": f"Item {i}", "description": f"Description of item {i}", "owner_id": OWNER}
+            for i in range(count)
+        ])
+    return sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+def build_app(session_factory):
+    from typing import List
+
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse
+
+    from app.core.serialization import json_rows_response
+    from app.models.item import Item as ItemModel
+    from app.schemas.item import Item
+    from app.services.item_service import ItemService
+
+    # The application's default response class before FastJSONResponse
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/orm", response_model=List[Item])
+    async def orm(limit: int):
+        with session_factory() as db:
+            return (
+                db.query(ItemModel)
+                .filter(ItemModel.owner_id == OWNER)
+                .order_by(ItemModel.id)
+                .limit(limit)
+                .all()
+            )
+
+    @app.get("/rows", response_model=List[Item])
+    async def rows(limit: int):
+        with session_factory() as db:
+            return json_rows_response(ItemService.get_user_items_rows(db, user_id=OWNER, limit=limit))
+
+    return app
+
+
+async def measure(app, total: int, page_sizes: list[int]) -> None:
+    """Request each page size total times from both endpoints and print the mean latencies."""
+    import httpx
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for limit in page_sizes:
+            orm = await client.get("/orm", params={"limit": limit})
+            rows = await client.get("/rows", params={"limit": limit})
+            assert json.loads(orm.content) == json.loads(rows.content), "The endpoints disagree"
+
+            latencies = {}
+            for path in ("orm", "rows"):
+                start = time.perf_counter()
+                for _ in range(total):
+                    (await client.get(f"/{path}", params={"limit": limit})).raise_for_status()
+                latencies[path] = (time.perf_counter() - start) / total * 1000
+
+            print(f"{limit:5d} rows  ORM + response_model: {latencies['orm']:7.2f} ms"
+                  f"   rows + json_rows_response: {latencies['rows']:7.2f} ms"
+                  f"  ({latencies['orm'] / latencies['rows']:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint and page size")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000], help="Rows per page")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        session_factory = seed(f"sqlite:///{os.path.join(tmp, 'bench.db')}", max(args.page_sizes))
+        asyncio.run(measure(build_app(session_factory), args.requests, args.page_sizes))
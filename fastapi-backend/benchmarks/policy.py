@@ -0,0 +1,104 @@
+"""
+Role checks: compiled policies vs. the former list scans.
+
+Times, with timeit, the check a route's role dependency runs on every
+request, for a token carrying many realm and client roles:
+
+- "list scan": what has_role / has_client_role did before the policy
+  layer, `role in user_roles` over the token's role lists for each
+  required role.
+- "policy": the predicate a Policy compiles to, over the frozensets
+  of UserRoles. The normalization of the token into UserRoles runs once
+  per request and is shared by every check of that request; it is
+  timed separately, and per request with --checks checks.
+
+Usage (from fastapi-backend):
+
+    python -m benchmarks.policy --roles 50 --checks 3
+"""
+import argparse
+import os
+import timeit
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("KEYCLOAK_SERVER_URL", "http://127.0.0.1:1")
+os.environ.setdefault("KEYCLOAK_REALM", "bench")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "backend-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+
+
+def scan_realm(token_data, required_roles, require_all):
+    """The check has_role made before the policy layer."""
+    user_roles = token_data.get("realm_access", {}).get("roles", [])
+    if require_all:
+        return all(role in user_roles for role in required_roles)
+    return any(role in user_roles for role in required_roles)
+
+
+def scan_client(token_data, client_id, required_roles, require_all):
+    """The check has_client_role made before the policy layer."""
+    user_roles = token_data.get("resource_access", {}).get(client_id, {}).get("roles", [])
+    if require_all:
+        return all(role in user_roles for role in required_roles)
+    return any(role in user_roles for role in required_roles)
+
+
+def token(roles: int, clients: int) -> dict:
+    """Token claims with roles realm roles and as many roles on each of clients clients."""
+    return {
+        "realm_access": {"roles": [f"realm-role-{i}" for i in range(roles)]},
+        "resource_access": {
+            f"client-{c}": {"roles": [f"client-role-{i}" for i in range(roles)]} for c in range(clients)
+        },
+    }
+
+
+def main(args: argparse.Namespace) -> None:
+    from app.core.policy import ClientRoles, RealmRoles, UserRoles
+
+    token_data = token(args.roles, args.clients)
+    client_id = f"client-{args.clients - 1}"
+    # Roles at the end of the lists, or absent: the scans' worst cases
+    cases = {
+        "any of 3, last held": (["missing-1", "missing-2", f"realm-role-{args.roles - 1}"], False),
+        "any of 3, none held": (["missing-1", "missing-2", "missing-3"], False),
+        "all of 3, all held": ([f"realm-role-{args.roles - i}" for i in (1, 2, 3)], True),
+    }
+
+    user = UserRoles.from_token(token_data)
+    normalize = timeit.Timer(lambda: UserRoles.from_token(token_data)).autorange()
+    normalize_us = normalize[1] / normalize[0] * 1e6
+    print(f"UserRoles.from_token ({args.roles} realm roles, {args.clients} clients): {normalize_us:.2f} us per request")
+    print()
+
+    def per_call_us(fn) -> float:
+        number, _ = timeit.Timer(fn).autorange()
+        return min(timeit.repeat(fn, number=number, repeat=args.repeat)) / number * 1e6
+
+    for name, (roles, require_all) in cases.items():
+        client_roles = [role.replace("realm", "client") for role in roles]
+        realm_predicate = RealmRoles(frozenset(roles), require_all).compile()
+        client_predicate = ClientRoles(client_id, frozenset(client_roles), require_all).compile()
+        assert realm_predicate(user) == scan_realm(token_data, roles, require_all)
+        assert client_predicate(user) == scan_client(token_data, client_id, client_roles, require_all)
+
+        for kind, scan, predicate in (
+            ("realm", lambda: scan_realm(token_data, roles, require_all), lambda: realm_predicate(user)),
+            ("client", lambda: scan_client(token_data, client_id, client_roles, require_all),
+             lambda: client_predicate(user)),
+        ):
+            scan_us, policy_us = per_call_us(scan), per_call_us(predicate)
+            request_us = normalize_us + args.checks * policy_us
+            print(f"{kind:6s}  {name:20s}  list scan: {scan_us:6.3f} us   policy: {policy_us:6.3f} us"
+                  f"  ({scan_us / policy_us:.1f}x)   per request with {args.checks} checks:"
+                  f" {args.checks * scan_us:6.2f} vs {request_us:6.2f} us")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--roles", type=int, default=50, help="Realm roles, and roles per client, in the token")
+    parser.add_argument("--clients", type=int, default=5, help="Clients with roles in the token")
+    parser.add_argument("--checks", type=int, default=3, help="Role checks per request")
+    parser.add_argument("--repeat", type=int, default=5, help="timeit repetitions; the best is kept")
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,43 @@
+import os
+
+# Settings are read when the app is imported; tests never reach these services
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("KEYCLOAK_SERVER_URL", "http://keycloak.test")
+os.environ.setdefault("KEYCLOAK_REALM", "test")
+os.environ.setdefault("KEYCLOAK_CLIENT_ID", "backend-client")
+os.environ.setdefault("KEYCLOAK_CLIENT_SECRET", "secret")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models.database import Base
+from app.schemas.user import UserInfo
+
+
+@pytest.fixture
+def engine():
+    """A fresh in-memory SQLite database with the application's schema."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    """A session on the test database, configured like SessionLocal."""
+    session = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def alice() -> UserInfo:
+    return UserInfo(sub="alice-id", preferred_username="alice", email="alice@example.com")
+
+
+@pytest.fixture
+def bob() -> UserInfo:
+    return UserInfo(sub="bob-id", preferred_username="bob", email="bob@example.com")
@@ -0,0 +1,118 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from app.core import http_client, security
+from app.core.cache import TTLCache
+from app.core.cache_backends import FakeRedis, MemoryCacheBackend, RedisCacheBackend, TieredCacheBackend
+from app.core.singleflight import SingleFlight
+
+
+def _tiered() -> TieredCacheBackend:
+    return TieredCacheBackend(
+        MemoryCacheBackend(TTLCache(max_size=100, max_ttl=60)),
+        RedisCacheBackend(FakeRedis(), namespace="test", max_ttl=60),
+    )
+
+
+class _FailingRedis(FakeRedis):
+    """A Redis client whose every command fails, as when the server is unreachable."""
+
+    async def get(self, name):
+        raise ConnectionError("Redis is down")
+
+    async def set(self, name, value, px=None):
+        raise ConnectionError("Redis is down")
+
+
+def test_tiered_hit_in_l2_is_copied_to_l1():
+    async def scenario():
+        cache = _tiered()
+        await cache.set("key", {"sub": "alice-id"}, ttl=30)
+        await cache.l1.delete("key")
+
+        assert await cache.get("key") == {"sub": "alice-id"}
+        assert await cache.l1.get("key") == {"sub": "alice-id"}
+
+    asyncio.run(scenario())
+
+
+def test_tiered_copy_in_l1_does_not_outlive_l2_expiry():
+    async def scenario():
+        cache = _tiered()
+        # The L2 entry outlives its recorded expiry, as after clock skew between workers
+        await cache.l2.set("key", {"value": "claims", "expires_at": time.time() + 0.1}, ttl=60)
+
+        assert await cache.get("key") == "claims"
+        await asyncio.sleep(0.15)
+        assert await cache.l1.get("key") is None
+        assert await cache.get("key") is None
+
+    asyncio.run(scenario())
+
+
+def test_redis_error_is_a_miss():
+    async def scenario():
+        backend = RedisCacheBackend(_FailingRedis(), namespace="test", max_ttl=60)
+        await backend.set("key", "value", ttl=30)
+
+        assert await backend.get("key") is None
+        assert backend.stats()["errors"] == 2
+
+    asyncio.run(scenario())
+
+
+@pytest.fixture
+def keycloak(monkeypatch):
+    """A stub Keycloak answering introspection with the configured status and activity."""
+    state = {"status": 200, "active": True, "calls": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        state["calls"] += 1
+        if state["status"] != 200:
+            return httpx.Response(state["status"])
+        return httpx.Response(200, json={"active": state["active"], "sub": "alice-id", "exp": time.time() + 300})
+
+    monkeypatch.setattr(security, "token_cache", _tiered())
+    monkeypatch.setattr(security, "introspection_calls", SingleFlight())
+    monkeypatch.setattr(http_client, "_keycloak_client", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    return state
+
+
+async def _validate(token: str) -> int:
+    """Returns 200 if the token validates, or the HTTP error status."""
+    try:
+        await security.validate_token(token)
+    except HTTPException as e:
+        return e.status_code
+    return 200
+
+
+def test_inactive_token_is_negative_cached(keycloak):
+    keycloak["active"] = False
+
+    async def scenario():
+        assert await _validate("inactive-token") == 401
+        assert await security.token_cache.get(security._token_cache_key("inactive-token")) == {"active": False}
+        assert await _validate("inactive-token") == 401
+
+    asyncio.run(scenario())
+    assert keycloak["calls"] == 1
+
+
+def test_failed_introspection_is_not_cached(keycloak):
+    keycloak["status"] = 500
+
+    async def scenario():
+        assert await _validate("valid-token") == 503
+        assert await security.token_cache.get(security._token_cache_key("valid-token")) is None
+
+        # Keycloak recovers: the token is introspected again and accepted
+        keycloak["status"] = 200
+        assert await _validate("valid-token") == 200
+
+    asyncio.run(scenario())
+    assert keycloak["calls"] == 2
@@ -0,0 +1,86 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import items
+from app.config import settings
+from app.core.security import get_current_user
+from app.models.database import get_db
+from app.models.item import Item
+from app.schemas.item import ItemCreate
+from app.services.item_service import ItemService
+
+
+@pytest.fixture
+def client(db, alice):
+    """The items API on the test database, with alice as the authenticated user."""
+    app = FastAPI()
+    app.include_router(items.router, prefix="/api")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: alice
+    return TestClient(app)
+
+
+def test_batch_create(client, db, alice):
+    response = client.post("/api/items/batch", json=[{"title": "One"}, {"title": "Two", "description": "2"}])
+
+    assert response.status_code == 201
+    results = response.json()
+    assert [r["status"] for r in results] == ["created", "created"]
+    assert [r["item"]["title"] for r in results] == ["One", "Two"]
+    assert ItemService.count_items(db, owner_id=alice.sub) == (2, True)
+
+
+def test_batch_update_reports_items_of_others_as_not_found(client, db, alice, bob):
+    mine = ItemService.create_item(db, ItemCreate(title="Mine"), alice.sub)
+    theirs = ItemService.create_item(db, ItemCreate(title="Theirs"), bob.sub)
+
+    response = client.put("/api/items/batch", json=[
+        {"id": mine.id, "title": "Renamed"},
+        {"id": theirs.id, "title": "Renamed"},
+        {"id": 12345, "title": "Renamed"},
+    ])
+
+    assert response.status_code == 200
+    assert [(r["id"], r["status"]) for r in response.json()] == [
+        (mine.id, "updated"), (theirs.id, "not_found"), (12345, "not_found"),
+    ]
+    db.expire_all()
+    assert db.get(Item, mine.id).title == "Renamed"
+    assert db.get(Item, theirs.id).title == "Theirs"
+    assert db.get(Item, theirs.id).version == 1
+
+
+def test_batch_delete_reports_items_of_others_as_not_found(client, db, alice, bob):
+    mine = ItemService.create_item(db, ItemCreate(title="Mine"), alice.sub)
+    theirs = ItemService.create_item(db, ItemCreate(title="Theirs"), bob.sub)
+
+    response = client.post("/api/items/batch/delete", json={"ids": [mine.id, theirs.id, 12345]})
+
+    assert response.status_code == 200
+    assert [(r["id"], r["status"]) for r in response.json()] == [
+        (mine.id, "deleted"), (theirs.id, "not_found"), (12345, "not_found"),
+    ]
+    assert ItemService.get_item(db, mine.id) is None
+    assert ItemService.get_item(db, theirs.id) is not None
+    assert ItemService.count_items(db, owner_id=bob.sub) == (1, True)
+
+
+@pytest.mark.parametrize("method, path, body", [
+    ("POST", "/api/items/batch", [{"title": "New"}] * 4),
+    ("PUT", "/api/items/batch", [{"id": i, "title": "Renamed"} for i in range(4)]),
+    ("POST", "/api/items/batch/delete", {"ids": list(range(4))}),
+])
+def test_batch_above_the_maximum_size_is_413(client, db, monkeypatch, method, path, body):
+    monkeypatch.setattr(settings, "ITEM_BATCH_MAX_SIZE", 3)
+
+    response = client.request(method, path, json=body)
+
+    assert response.status_code == 413
+    assert db.query(Item).count() == 0
+
+
+def test_batch_at_the_maximum_size_is_accepted(client, monkeypatch):
+    monkeypatch.setattr(settings, "ITEM_BATCH_MAX_SIZE", 3)
+
+    assert client.post("/api/items/batch", json=[{"title": "New"}] * 3).status_code == 201
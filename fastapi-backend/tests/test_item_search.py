@@ -0,0 +1,79 @@
+from app.schemas.item import ItemCreate, ItemUpdate
+from app.services.item_service import ItemService
+
+
+def _create(db, owner, title, description=None):
+    return ItemService.create_item(db, ItemCreate(title=title, description=description), owner.sub)
+
+
+def _search(db, query, owner):
+    return [row["id"] for row in ItemService.search_items_rows(db, query=query, owner_id=owner.sub)]
+
+
+def test_search_matches_title_and_description(db, alice):
+    in_title = _create(db, alice, "Grocery list")
+    in_description = _create(db, alice, "Errands", "Pick up the grocery order")
+    _create(db, alice, "Unrelated")
+
+    assert sorted(_search(db, "grocery", alice)) == [in_title.id, in_description.id]
+
+
+def test_search_matches_the_last_word_as_a_prefix(db, alice):
+    item = _create(db, alice, "Quarterly report draft")
+
+    assert _search(db, "quarterly rep", alice) == [item.id]
+    assert _search(db, "quar", alice) == [item.id]
+    # Only the last word is a prefix; the others must match whole
+    assert _search(db, "quar report", alice) == []
+
+
+def test_search_requires_every_word(db, alice):
+    item = _create(db, alice, "Quarterly report")
+    _create(db, alice, "Annual report")
+
+    assert _search(db, "quarterly report", alice) == [item.id]
+
+
+def test_search_ignores_query_syntax(db, alice):
+    item = _create(db, alice, "Report")
+
+    assert _search(db, '"report*', alice) == [item.id]
+    assert _search(db, "title:report", alice) == []
+    assert _search(db, "*", alice) == []
+
+
+def test_search_is_scoped_to_the_owner(db, alice, bob):
+    mine = _create(db, alice, "Shared title")
+    theirs = _create(db, bob, "Shared title")
+
+    assert _search(db, "shared", alice) == [mine.id]
+    assert _search(db, "shared", bob) == [theirs.id]
+    rows = ItemService.search_items_rows(db, query="shared")
+    assert sorted(row["id"] for row in rows) == [mine.id, theirs.id]
+
+
+def test_index_follows_updates(db, alice):
+    item = _create(db, alice, "Old name", "Some notes")
+
+    ItemService.update_item(db, item.id, ItemUpdate(title="New name"), alice)
+
+    assert _search(db, "new", alice) == [item.id]
+    assert _search(db, "old", alice) == []
+    # The description was not changed and is still indexed
+    assert _search(db, "notes", alice) == [item.id]
+
+
+def test_index_follows_deletes(db, alice):
+    item = _create(db, alice, "Temporary")
+
+    ItemService.delete_item(db, item.id, alice)
+
+    assert _search(db, "temporary", alice) == []
+
+
+def test_index_follows_batch_writes(db, alice):
+    items = ItemService.create_items(db, [ItemCreate(title="Batch one"), ItemCreate(title="Batch two")], alice.sub)
+    assert sorted(_search(db, "batch", alice)) == [item.id for item in items]
+
+    ItemService.delete_items(db, [items[0].id], alice)
+    assert _search(db, "batch", alice) == [items[1].id]
@@ -0,0 +1,50 @@
+from app.models.item import Item
+from app.schemas.item import ItemCreate, ItemUpdate
+from app.services.item_service import ItemService
+
+
+def _create(db, owner):
+    return ItemService.create_item(db, ItemCreate(title="Original", description="Unchanged"), owner.sub)
+
+
+def test_update_item_by_owner(db, alice):
+    item = _create(db, alice)
+
+    updated = ItemService.update_item(db, item.id, ItemUpdate(title="Renamed"), alice)
+
+    assert updated.title == "Renamed"
+    assert updated.description == "Unchanged"
+    assert updated.version == 2
+
+
+def test_update_item_not_found(db, alice):
+    assert ItemService.update_item(db, 12345, ItemUpdate(title="Renamed"), alice) is None
+
+
+def test_update_item_not_owner(db, alice, bob):
+    item = _create(db, alice)
+
+    assert ItemService.update_item(db, item.id, ItemUpdate(title="Renamed"), bob) is None
+
+    db.expire_all()
+    stored = db.get(Item, item.id)
+    assert stored.title == "Original"
+    assert stored.version == 1
+
+
+def test_delete_item_by_owner(db, alice):
+    item = _create(db, alice)
+
+    assert ItemService.delete_item(db, item.id, alice) is True
+    assert ItemService.get_item(db, item.id) is None
+
+
+def test_delete_item_not_found(db, alice):
+    assert ItemService.delete_item(db, 12345, alice) is False
+
+
+def test_delete_item_not_owner(db, alice, bob):
+    item = _create(db, alice)
+
+    assert ItemService.delete_item(db, item.id, bob) is False
+    assert ItemService.get_item(db, item.id) is not None
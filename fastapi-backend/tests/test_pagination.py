@@ -0,0 +1,82 @@
+import base64
+import json
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+
+from app.core.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor, set_next_cursor
+from app.schemas.item import ItemCreate
+from app.services.item_service import ItemService
+
+
+def _token(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).rstrip(b"=").decode()
+
+
+def test_cursor_round_trip():
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert decode_cursor(encode_cursor("alice-id"), key_type=str) == "alice-id"
+    # Unpadded and URL-safe
+    assert "=" not in encode_cursor(1)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor!",
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    _token([1]),
+    _token({"key": 1}),
+    _token({"k": "1"}),
+    _token({"k": True}),
+    _token({"k": None}),
+    _token({"k": 1.5}),
+])
+def test_malformed_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor)
+    assert e.value.status_code == 400
+
+
+def test_cursor_of_the_wrong_key_type_is_400():
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(encode_cursor(42), key_type=str)
+    assert e.value.status_code == 400
+
+
+def test_next_cursor_only_on_full_pages():
+    rows = [{"id": 1}, {"id": 2}]
+
+    full = Response()
+    set_next_cursor(full, rows, limit=2)
+    assert decode_cursor(full.headers[NEXT_CURSOR_HEADER]) == 2
+
+    partial, empty = Response(), Response()
+    set_next_cursor(partial, rows, limit=3)
+    set_next_cursor(empty, [], limit=2)
+    assert NEXT_CURSOR_HEADER not in partial.headers
+    assert NEXT_CURSOR_HEADER not in empty.headers
+
+
+def test_next_cursor_from_objects_and_other_keys():
+    response = Response()
+    set_next_cursor(response, [SimpleNamespace(id="bob-id"), SimpleNamespace(id="carol-id")], limit=2)
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER], key_type=str) == "carol-id"
+
+
+def test_cursor_pages_cover_every_item_once(db, alice, bob):
+    created = ItemService.create_items(db, [ItemCreate(title=f"Item {i}") for i in range(7)], alice.sub)
+    ItemService.create_items(db, [ItemCreate(title="Not mine")], bob.sub)
+
+    seen, cursor = [], None
+    while True:
+        after_id = decode_cursor(cursor) if cursor else None
+        rows = ItemService.get_user_items_rows(db, user_id=alice.sub, limit=3, after_id=after_id)
+        seen.extend(row["id"] for row in rows)
+        response = Response()
+        set_next_cursor(response, rows, limit=3)
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+
+    assert seen == [item.id for item in created]
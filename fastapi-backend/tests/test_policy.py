@@ -0,0 +1,84 @@
+import itertools
+
+import pytest
+
+from app.core.policy import AllOf, AnyOf, ClientRoles, RealmRoles, UserRoles
+
+
+def _scan_realm(token_data, required_roles, require_all):
+    """The check has_role made before the policy layer: a scan of the token's role list."""
+    user_roles = token_data.get("realm_access", {}).get("roles", [])
+    if require_all:
+        return all(role in user_roles for role in required_roles)
+    return any(role in user_roles for role in required_roles)
+
+
+def _scan_client(token_data, client_id, required_roles, require_all):
+    """The check has_client_role made before the policy layer."""
+    user_roles = token_data.get("resource_access", {}).get(client_id, {}).get("roles", [])
+    if require_all:
+        return all(role in user_roles for role in required_roles)
+    return any(role in user_roles for role in required_roles)
+
+
+TOKENS = [
+    {},
+    {"realm_access": {"roles": []}, "resource_access": {}},
+    {"realm_access": {"roles": ["user"]}},
+    {"realm_access": {"roles": ["user", "admin"]}, "resource_access": {"backend-client": {"roles": ["editor"]}}},
+    {"resource_access": {"backend-client": {"roles": ["editor", "viewer"]}, "other-client": {"roles": ["admin"]}}},
+]
+
+ROLE_LISTS = [[], ["admin"], ["user", "admin"], ["editor"], ["editor", "viewer"], ["missing"]]
+
+CASES = list(itertools.product(TOKENS, ROLE_LISTS, [False, True]))
+
+
+@pytest.mark.parametrize("token_data, roles, require_all", CASES)
+def test_realm_roles_match_the_list_scan(token_data, roles, require_all):
+    predicate = RealmRoles(frozenset(roles), require_all).compile()
+
+    assert predicate(UserRoles.from_token(token_data)) == _scan_realm(token_data, roles, require_all)
+
+
+@pytest.mark.parametrize("token_data, roles, require_all", CASES)
+def test_client_roles_match_the_list_scan(token_data, roles, require_all):
+    predicate = ClientRoles("backend-client", frozenset(roles), require_all).compile()
+
+    assert predicate(UserRoles.from_token(token_data)) == _scan_client(token_data, "backend-client", roles, require_all)
+
+
+def test_empty_role_list():
+    # As with the list scan: no role is "any of none", every user has "all of none"
+    user = UserRoles.from_token(TOKENS[3])
+
+    assert RealmRoles(frozenset()).compile()(user) is False
+    assert RealmRoles(frozenset(), require_all=True).compile()(user) is True
+    assert ClientRoles("backend-client", frozenset()).compile()(user) is False
+    assert ClientRoles("backend-client", frozenset(), require_all=True).compile()(user) is True
+    assert AnyOf(()).compile()(user) is False
+    assert AllOf(()).compile()(user) is True
+
+
+@pytest.mark.parametrize("token_data", TOKENS)
+def test_nested_policies_combine_like_the_list_scans(token_data):
+    admin = RealmRoles(frozenset({"admin"}))
+    editor_and_viewer = ClientRoles("backend-client", frozenset({"editor", "viewer"}), require_all=True)
+    other_admin = ClientRoles("other-client", frozenset({"admin"}))
+    policy = (admin | editor_and_viewer) & AnyOf((other_admin, RealmRoles(frozenset({"user"}))))
+
+    expected = (
+        (_scan_realm(token_data, ["admin"], False)
+         or _scan_client(token_data, "backend-client", ["editor", "viewer"], True))
+        and (_scan_client(token_data, "other-client", ["admin"], False)
+             or _scan_realm(token_data, ["user"], False))
+    )
+    assert policy.compile()(UserRoles.from_token(token_data)) == expected
+
+
+def test_operators_build_nested_policies():
+    a, b, c = RealmRoles(frozenset({"a"})), RealmRoles(frozenset({"b"})), RealmRoles(frozenset({"c"}))
+
+    assert (a & b) | c == AnyOf((AllOf((a, b)), c))
+    # Equal policies are interchangeable, so identical requirements can share a dependency
+    assert hash(RealmRoles(frozenset({"a", "b"}))) == hash(RealmRoles(frozenset({"b", "a"})))
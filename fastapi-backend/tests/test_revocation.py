@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+from app.core.cache_backends import FakeRedis, RedisCacheBackend
+from app.core.revocation import RevocationStore
+
+
+class _CountingRedis(FakeRedis):
+    """FakeRedis that counts the read commands sent to it."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    async def get(self, name):
+        self.reads += 1
+        return await super().get(name)
+
+    async def mget(self, keys):
+        self.reads += 1
+        return [await FakeRedis.get(self, name) for name in keys]
+
+
+def test_session_revocation():
+    async def scenario():
+        store = RevocationStore(retention=60)
+        await store.revoke_session("session-1")
+
+        assert await store.is_revoked({"sub": "alice-id", "sid": "session-1"})
+        # Older Keycloak versions put the session ID in session_state
+        assert await store.is_revoked({"sub": "alice-id", "session_state": "session-1"})
+        assert not await store.is_revoked({"sub": "alice-id", "sid": "session-2"})
+
+    asyncio.run(scenario())
+
+
+def test_token_revocation():
+    async def scenario():
+        store = RevocationStore(retention=60)
+        await store.revoke_token("token-1", exp=time.time() + 60)
+
+        assert await store.is_revoked({"sub": "alice-id", "jti": "token-1"})
+        assert not await store.is_revoked({"sub": "alice-id", "jti": "token-2"})
+
+    asyncio.run(scenario())
+
+
+def test_subject_revocation_only_matches_tokens_issued_before():
+    async def scenario():
+        store = RevocationStore(retention=60)
+        logout = time.time()
+        await store.revoke_logout({"sub": "alice-id", "iat": logout})
+
+        assert await store.is_revoked({"sub": "alice-id", "iat": logout - 10})
+        assert await store.is_revoked({"sub": "alice-id", "iat": logout})
+        assert not await store.is_revoked({"sub": "alice-id", "iat": logout + 10})
+        assert not await store.is_revoked({"sub": "bob-id", "iat": logout - 10})
+
+    asyncio.run(scenario())
+
+
+def test_expired_revocations_are_pruned():
+    async def scenario():
+        store = RevocationStore(retention=60)
+        await store.revoke_token("token-1", exp=time.time() + 0.05)
+        await asyncio.sleep(0.1)
+        assert not await store.is_revoked({"sub": "alice-id", "jti": "token-1"})
+
+        # The next revocation prunes the expired one
+        await store.revoke_token("token-2", exp=time.time() + 60)
+        assert store.stats()["tokens"] == 1
+        assert store._expiries == [(store._entries["jti"]["token-2"], "jti", "token-2")]
+
+    asyncio.run(scenario())
+
+
+def test_revoking_again_replaces_the_entry():
+    async def scenario():
+        store = RevocationStore(retention=60)
+        await store.revoke_token("token-1", exp=time.time() + 0.05)
+        await store.revoke_token("token-1", exp=time.time() + 60)
+        await asyncio.sleep(0.1)
+        store.prune()
+
+        # The heap entry of the first revocation expired, but not the revocation itself
+        assert store.stats()["tokens"] == 1
+        assert await store.is_revoked({"sub": "alice-id", "jti": "token-1"})
+
+    asyncio.run(scenario())
+
+
+def test_revocations_are_shared_in_one_read():
+    async def scenario():
+        redis = _CountingRedis()
+        worker_1 = RevocationStore(retention=60, shared=RedisCacheBackend(redis, "revocation", max_ttl=60))
+        worker_2 = RevocationStore(retention=60, shared=RedisCacheBackend(redis, "revocation", max_ttl=60))
+        logout = time.time()
+        await worker_1.revoke_logout({"sub": "alice-id", "iat": logout})
+
+        token = {"sub": "alice-id", "sid": "session-1", "jti": "token-1", "iat": logout - 10}
+        assert await worker_2.is_revoked(token)
+        assert redis.reads == 1
+
+        # Now kept in worker_2's memory
+        assert await worker_2.is_revoked(token)
+        assert redis.reads == 1
+        assert not await worker_2.is_revoked({**token, "iat": logout + 10})
+
+    asyncio.run(scenario())
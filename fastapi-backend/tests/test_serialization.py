@@ -0,0 +1,58 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+from app.core.serialization import FastJSONResponse, json_rows_response
+from app.schemas.user import UserVO
+
+USER = {
+    "id": "alice-id",
+    "username": "alice",
+    "email": "alice@example.com",
+    "profile_data": {"theme": "dark", "tags": ["a", "b"]},
+    # Naive, as SQLite returns them, and timezone-aware, as PostgreSQL does
+    "created_at": datetime(2024, 1, 2, 3, 4, 5, 123456),
+    "updated_at": datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc),
+    "version": 3,
+}
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/json", response_model=UserVO, response_class=JSONResponse)
+    def with_json_response():
+        return UserVO(**USER)
+
+    @app.get("/fast", response_model=UserVO, response_class=FastJSONResponse)
+    def with_fast_json_response():
+        return UserVO(**USER)
+
+    @app.get("/rows", response_model=UserVO)
+    def with_rows():
+        # As get_users_rows returns them: every column, labelled with the camelCase
+        # aliases, and datetimes as the database driver returns them
+        return json_rows_response([UserVO(**USER).model_dump(by_alias=True)])
+
+    return TestClient(app)
+
+
+def test_user_vo_renders_the_same_with_both_response_classes():
+    client = _client()
+    expected = client.get("/json").json()
+
+    assert expected["profileData"] == {"theme": "dark", "tags": ["a", "b"]}
+    assert expected["createdAt"] == "2024-01-02T03:04:05.123456"
+    assert expected["updatedAt"] == "2024-01-02T03:04:05Z"
+    assert client.get("/fast").json() == expected
+    assert client.get("/rows").json() == [expected]
+
+
+def test_fast_json_response_is_compact_utf8():
+    response = _client().get("/fast")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == json.dumps(response.json(), separators=(",", ":")).encode()
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import event
+
+from app.schemas.user import UserInfo
+from app.services.user_service import UserService
+
+
+@pytest.fixture
+def statements(engine):
+    """Records the kind of every statement run on the engine, and COMMIT for each commit."""
+    recorded = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement.split(None, 1)[0].upper())
+
+    def commit(conn):
+        recorded.append("COMMIT")
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "commit", commit)
+    yield recorded
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    event.remove(engine, "commit", commit)
+
+
+def test_sync_new_user_is_one_insert(db, alice, statements):
+    user = UserService.sync_user(db, alice)
+
+    assert user.id == alice.sub
+    assert statements == ["INSERT", "COMMIT"]
+
+
+def test_sync_changed_user_is_one_insert(db, alice, statements):
+    UserService.sync_user(db, alice)
+    statements.clear()
+
+    changed = UserInfo(sub=alice.sub, preferred_username="alice2", email=alice.email)
+    user = UserService.sync_user(db, changed)
+
+    assert user.username == "alice2"
+    assert user.version == 2
+    assert statements == ["INSERT", "COMMIT"]
+
+
+def test_sync_unchanged_user_writes_nothing(db, alice, statements):
+    UserService.sync_user(db, alice)
+    statements.clear()
+
+    user = UserService.sync_user(db, alice)
+
+    assert user.id == alice.sub
+    assert user.version == 1
+    assert statements == ["INSERT", "SELECT"]